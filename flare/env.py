@@ -266,6 +266,26 @@ class AtomicEnvironment:
                 cf.quadratic_cutoff,
             )
 
+    def to_arrays(self):
+        """
+        Returns the raw arrays used by the 2- and 3-body kernels, so that
+        several environments can be stacked and passed to Numba routines.
+
+        :return: bond_array_2, ctype, etypes, bond_array_3, cross_bond_inds,
+            cross_bond_dists, triplet_counts
+        :rtype: tuple
+        """
+
+        return (
+            self.bond_array_2,
+            self.ctype,
+            self.etypes,
+            self.bond_array_3,
+            self.cross_bond_inds,
+            self.cross_bond_dists,
+            self.triplet_counts,
+        )
+
     def as_str(self) -> str:
         """
         Returns string dictionary serialization cast as string.
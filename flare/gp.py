@@ -13,10 +13,17 @@ from flare.gp_algebra import (
     get_like_from_mats,
     get_neg_like_grad,
     get_ky_mat_update,
+    update_l_mat,
+    jittered_cholesky_factor,
+    cholesky_solve,
+    cholesky_inverse,
+    close_pool,
     _global_training_data,
     _global_training_labels,
     _global_training_structures,
     _global_energy_labels,
+    _global_training_arrays,
+    _cupy_present,
     get_Ky_mat,
     get_kernel_vector,
     en_kern_vec,
@@ -32,9 +39,13 @@ from flare.parameters import Parameters
 from flare.struc import Structure
 from flare.utils.element_coder import NumpyEncoder, Z_to_element
 from numpy.random import random
+from scipy import __version__ as _scipy_version
 from scipy.linalg import solve_triangular
 from scipy.optimize import minimize
 
+# BFGS accepts a starting inverse Hessian (hess_inv0) from SciPy 1.11 on
+_bfgs_hess_inv0 = tuple(int(v) for v in _scipy_version.split(".")[:2]) >= (1, 11)
+
 
 class GaussianProcess:
     """Gaussian process force field. Implementation is based on Algorithm 2.1
@@ -62,6 +73,16 @@ class GaussianProcess:
             Defaults to 'L-BFGS-B'.
         maxiter (int, optional): Maximum number of iterations of the
             hyperparameter optimization algorithm. Defaults to 10.
+        maxcor (int, optional): Number of corrections kept by L-BFGS-B to
+            approximate the Hessian. Defaults to 10.
+        hyps_tol (float, optional): If set, train returns without optimizing
+            when the hyperparameters are within hyps_tol of those found by
+            the previous training and the number of labels has grown by at
+            most retrain_fraction since then. Defaults to None (always
+            train).
+        retrain_fraction (float, optional): Relative growth of the number
+            of labels above which the model is always retrained when
+            hyps_tol is set. Defaults to 0.1.
         parallel (bool, optional): If True, the covariance matrix K of the GP is
             computed in parallel. Defaults to False.
         n_cpus (int, optional): Number of cpus used for parallel
@@ -74,6 +95,12 @@ class GaussianProcess:
             is used for what interaction. Details see kernels/mc_sephyps.py
         name (str, optional): Name for the GP instance which dictates global
             memory access.
+        precision (str, optional): Floating point precision of the mean and
+            variance algebra at prediction time, "f64" or "f32". Training is
+            always done in double precision. Defaults to "f64".
+        device (str, optional): Device used to factor the covariance matrix,
+            "cpu" or "gpu". The GPU path requires CuPy and falls back to the
+            CPU if it is not installed. Defaults to "cpu".
     """
 
     def __init__(
@@ -86,6 +113,9 @@ class GaussianProcess:
         hyp_labels: List = None,
         opt_algorithm: str = "L-BFGS-B",
         maxiter: int = 10,
+        maxcor: int = 10,
+        hyps_tol: float = None,
+        retrain_fraction: float = 0.1,
         parallel: bool = False,
         per_atom_par: bool = True,
         n_cpus: int = 1,
@@ -93,6 +123,8 @@ class GaussianProcess:
         output: Output = None,
         name="default_gp",
         energy_noise: float = 0.01,
+        precision: str = "f64",
+        device: str = "cpu",
         **kwargs,
     ):
         """Initialize GP parameters and training data."""
@@ -105,12 +137,22 @@ class GaussianProcess:
 
         self.per_atom_par = per_atom_par
         self.maxiter = maxiter
+        self.maxcor = maxcor
+        self.hyps_tol = hyps_tol
+        self.retrain_fraction = retrain_fraction
 
         # set up parallelization
         self.n_cpus = n_cpus
         self.n_sample = n_sample
         self.parallel = parallel
 
+        if precision not in ("f64", "f32"):
+            raise ValueError("precision should be 'f64' or 'f32'")
+        self.precision = precision
+        if device not in ("cpu", "gpu"):
+            raise ValueError("device should be 'cpu' or 'gpu'")
+        self.device = device
+
         self.component = component
         self.kernels = (
             ["twobody", "threebody"]
@@ -185,15 +227,19 @@ class GaussianProcess:
         self.energy_block = None
         self.force_energy_block = None
         self.l_mat = None
-        self.l_mat_inv = None
         self.alpha = None
         self.ky_mat_inv = None
         self.likelihood = None
         self.likelihood_gradient = None
         self.bounds = None
+        # Hyperparameters, number of labels and inverse Hessian estimate at
+        # the end of the last optimization, used to warm start the next one
+        self._last_opt_state = None
 
         # File used for reading / writing model if model is large
         self.ky_mat_file = None
+        # Hash of the state L and alpha were last computed from
+        self._state_hash = None
         # Flag if too-big warning has been printed for this model
         self.large_warning = False
 
@@ -207,6 +253,13 @@ class GaussianProcess:
                 self.logger_name = self.output.basename + "log"
         logger = logging.getLogger(self.logger_name)
 
+        if self.device == "gpu" and not _cupy_present:
+            logger.warning(
+                "Warning: CuPy could not be imported. The covariance "
+                "matrix will be factored on the CPU."
+            )
+            self.device = "cpu"
+
         if self.cutoffs == {}:
             # If no cutoffs are passed in, assume 7 A for 2 body, 3.5 for
             # 3-body.
@@ -231,6 +284,50 @@ class GaussianProcess:
 
         self.check_instantiation()
 
+    @property
+    def ky_mat_inv(self):
+        """Inverse of the covariance matrix. Predictions only need the
+        Cholesky factor L, so the inverse is computed from L on first access
+        and cached until L is reset."""
+
+        ky_mat_inv = getattr(self, "_ky_mat_inv", None)
+        l_mat = getattr(self, "l_mat", None)
+        if ky_mat_inv is None and l_mat is not None:
+            ky_mat_inv = cholesky_inverse(l_mat)
+            self._ky_mat_inv = ky_mat_inv
+
+        return ky_mat_inv
+
+    @ky_mat_inv.setter
+    def ky_mat_inv(self, ky_mat_inv):
+        self._ky_mat_inv = ky_mat_inv
+
+    def prediction_mats(self):
+        """Return alpha and L in the precision used for predictions. The
+        single precision copies are cached until alpha or L is replaced."""
+
+        if self.precision == "f64":
+            return self.alpha, self.l_mat
+
+        cache = getattr(self, "_f32_mats", None)
+        if cache is None or cache[0] is not self.alpha or cache[1] is not self.l_mat:
+            cache = (
+                self.alpha,
+                self.l_mat,
+                self.alpha.astype(np.float32),
+                self.l_mat.astype(np.float32),
+            )
+            self._f32_mats = cache
+
+        return cache[2], cache[3]
+
+    def cast_kernel_vector(self, k_v):
+        """Cast a kernel vector to the precision used for predictions."""
+
+        if self.precision == "f32":
+            return k_v.astype(np.float32)
+        return k_v
+
     @property
     def force_noise(self):
         return Parameters.get_noise(self.hyps_mask, self.hyps, constraint=False)
@@ -363,6 +460,7 @@ class GaussianProcess:
 
         # If forces are given, update the environment list.
         if forces is not None:
+            new_labels = []
             for atom in update_indices:
                 env_curr = AtomicEnvironment(
                     struc, atom, self.cutoffs, cutoffs_mask=self.hyps_mask
@@ -371,9 +469,12 @@ class GaussianProcess:
 
                 self.training_data.append(env_curr)
                 self.training_labels.append(forces_curr)
+                new_labels.append(forces_curr)
 
-            # create numpy array of training labels
-            self.training_labels_np = np.hstack(self.training_labels)
+            # append the new force components to the array of training labels
+            self.training_labels_np = np.concatenate(
+                (self.training_labels_np, self.force_list_to_np(new_labels))
+            )
 
         # If an energy is given, update the structure list.
         if energy is not None:
@@ -400,6 +501,25 @@ class GaussianProcess:
         )
         self.sync_data()
 
+    @staticmethod
+    def force_list_to_np(forces: List["ndarray"]) -> "ndarray":
+        """Flatten a list of force vectors into a single array of force
+        components ordered as (x_1, y_1, z_1, x_2, ...).
+
+        Args:
+            forces (List[np.ndarray]): Force vectors to be flattened.
+
+        Return:
+            np.ndarray: 1D array of force components.
+        """
+
+        if len(forces) == 0:
+            return np.empty(0)
+
+        return np.concatenate(
+            [np.ascontiguousarray(f, dtype=np.float64).ravel() for f in forces]
+        )
+
     def add_one_env(
         self,
         env: AtomicEnvironment,
@@ -420,10 +540,11 @@ class GaussianProcess:
         """
         self.training_data.append(env)
         if force is None:
-            self.training_labels.append(env.force)
-        else:
-            self.training_labels.append(force)
-        self.training_labels_np = np.hstack(self.training_labels)
+            force = env.force
+        self.training_labels.append(force)
+        self.training_labels_np = np.concatenate(
+            (self.training_labels_np, self.force_list_to_np([force]))
+        )
         self.sync_data()
 
         # update list of all labels
@@ -505,6 +626,20 @@ class GaussianProcess:
 
         x_0 = self.hyps
 
+        # skip the optimization if the previous optimum is still expected to
+        # hold for the current training set
+        last_state = self._last_opt_state
+        if (
+            self.hyps_tol is not None
+            and last_state is not None
+            and len(last_state["hyps"]) == len(x_0)
+            and np.linalg.norm(x_0 - last_state["hyps"]) < self.hyps_tol
+            and len(self.all_labels)
+            <= (1 + self.retrain_fraction) * last_state["n_labels"]
+        ):
+            self.set_L_alpha()
+            return None
+
         args = (
             self.name,
             self.kernel_grad,
@@ -540,6 +675,7 @@ class GaussianProcess:
                         "gtol": grad_tol,
                         "maxls": line_steps,
                         "maxiter": self.maxiter,
+                        "maxcor": self.maxcor,
                     },
                 )
             except np.linalg.LinAlgError:
@@ -563,21 +699,43 @@ class GaussianProcess:
                     "gtol": grad_tol,
                     "maxls": line_steps,
                     "maxiter": self.maxiter,
+                    "maxcor": self.maxcor,
                 },
             )
 
         elif self.opt_algorithm == "BFGS":
+            options = {"disp": disp, "gtol": grad_tol, "maxiter": self.maxiter}
+
+            # start from the inverse Hessian estimate of the last run
+            hess_inv = None if last_state is None else last_state["hess_inv"]
+            if (
+                _bfgs_hess_inv0
+                and hess_inv is not None
+                and hess_inv.shape == (len(x_0), len(x_0))
+            ):
+                options["hess_inv0"] = hess_inv
+
             res = minimize(
                 get_neg_like_grad,
                 x_0,
                 args,
                 method="BFGS",
                 jac=True,
-                options={"disp": disp, "gtol": grad_tol, "maxiter": self.maxiter},
+                options=options,
             )
 
         if res is None:
             raise RuntimeError("Optimization failed for some reason.")
+
+        # L-BFGS-B returns an operator rather than a matrix, which scipy
+        # cannot take back as a starting estimate
+        hess_inv = getattr(res, "hess_inv", None)
+        self._last_opt_state = {
+            "hyps": np.copy(res.x),
+            "n_labels": len(self.all_labels),
+            "hess_inv": hess_inv if isinstance(hess_inv, np.ndarray) else None,
+        }
+
         self.hyps = res.x
         self.set_L_alpha()
         self.likelihood = -res.fun
@@ -644,16 +802,19 @@ class GaussianProcess:
 
         # Guarantee that alpha is up to date with training set
         self.check_L_alpha()
+        alpha, l_mat = self.prediction_mats()
+        k_v = self.cast_kernel_vector(k_v)
 
         # get predictive mean
-        pred_mean = np.matmul(k_v, self.alpha)
+        pred_mean = np.float64(np.matmul(k_v, alpha))
 
-        # get predictive variance without cholesky (possibly faster)
+        # get predictive variance from a triangular solve with L
         # pass args to kernel based on if mult. hyperparameters in use
         args = from_mask_to_args(self.hyps, self.cutoffs, self.hyps_mask)
 
         self_kern = self.kernel(x_t, x_t, d, d, *args)
-        pred_var = self_kern - np.matmul(np.matmul(k_v, self.ky_mat_inv), k_v)
+        v_vec = solve_triangular(l_mat, k_v, lower=True)
+        pred_var = self_kern - np.float64(np.matmul(v_vec, v_vec))
 
         return pred_mean, pred_var
 
@@ -700,7 +861,8 @@ class GaussianProcess:
             n_sample=self.n_sample,
         )
 
-        pred_mean = np.matmul(k_v, self.alpha)
+        alpha, _ = self.prediction_mats()
+        pred_mean = np.float64(np.matmul(self.cast_kernel_vector(k_v), alpha))
 
         return pred_mean
 
@@ -735,16 +897,19 @@ class GaussianProcess:
             n_sample=self.n_sample,
         )
 
+        alpha, l_mat = self.prediction_mats()
+        k_v = self.cast_kernel_vector(k_v)
+
         # get predictive mean
-        pred_mean = np.matmul(k_v, self.alpha)
+        pred_mean = np.float64(np.matmul(k_v, alpha))
 
         # get predictive variance
-        v_vec = solve_triangular(self.l_mat, k_v, lower=True)
+        v_vec = solve_triangular(l_mat, k_v, lower=True)
         args = from_mask_to_args(self.hyps, self.cutoffs, self.hyps_mask)
 
         self_kern = self.energy_kernel(x_t, x_t, *args)
 
-        pred_var = self_kern - np.matmul(v_vec, v_vec)
+        pred_var = self_kern - np.float64(np.matmul(v_vec, v_vec))
 
         return pred_mean, pred_var
 
@@ -775,38 +940,68 @@ class GaussianProcess:
 
         # Check that alpha is up to date with training set.
         self.check_L_alpha()
+        alpha, l_mat = self.prediction_mats()
+        energy_vector = self.cast_kernel_vector(energy_vector)
+        force_array = self.cast_kernel_vector(force_array)
+        stress_array = self.cast_kernel_vector(stress_array)
 
         # Compute mean predictions.
-        en_pred = np.matmul(energy_vector, self.alpha)
-        force_pred = np.matmul(force_array, self.alpha)
-        stress_pred = np.matmul(stress_array, self.alpha)
+        en_pred = np.float64(np.matmul(energy_vector, alpha))
+        force_pred = np.matmul(force_array, alpha).astype(np.float64)
+        stress_pred = np.matmul(stress_array, alpha).astype(np.float64)
 
         # Compute uncertainties.
         args = from_mask_to_args(self.hyps, self.cutoffs, self.hyps_mask)
         self_en, self_force, self_stress = self.efs_self_kernel(x_t, *args)
 
-        en_var = self_en - np.matmul(
-            np.matmul(energy_vector, self.ky_mat_inv), energy_vector
-        )
-        force_var = self_force - np.diag(
-            np.matmul(np.matmul(force_array, self.ky_mat_inv), force_array.transpose())
-        )
-        stress_var = self_stress - np.diag(
-            np.matmul(
-                np.matmul(stress_array, self.ky_mat_inv), stress_array.transpose()
-            )
-        )
+        en_v = solve_triangular(l_mat, energy_vector, lower=True)
+        force_v = solve_triangular(l_mat, force_array.transpose(), lower=True)
+        stress_v = solve_triangular(l_mat, stress_array.transpose(), lower=True)
+
+        en_var = self_en - np.float64(np.matmul(en_v, en_v))
+        force_var = self_force - np.sum(force_v * force_v, axis=0, dtype=np.float64)
+        stress_var = self_stress - np.sum(stress_v * stress_v, axis=0, dtype=np.float64)
 
         return en_pred, force_pred, stress_pred, en_var, force_var, stress_var
 
+    def state_hash(self) -> int:
+        """Hash of the hyperparameters, kernel settings and training labels
+        that L and alpha depend on."""
+
+        return hash(
+            (
+                self.hyps.tobytes(),
+                self.all_labels.tobytes(),
+                len(self.training_data),
+                len(self.training_structures),
+                str(self.kernels),
+                self.kernel,
+                self.energy_force_kernel,
+                self.energy_kernel,
+                str(self.cutoffs),
+                str(self.hyps_mask),
+                self.energy_noise,
+            )
+        )
+
     def set_L_alpha(self):
         """
         Invert the covariance matrix, setting L (a lower triangular
         matrix s.t. L L^T = (K + sig_n^2 I)) and alpha, the inverse
         covariance matrix multiplied by the vector of training labels.
         The forces and variances are later obtained using alpha.
+        The factorization is skipped if the state it depends on has not
+        changed since the last call.
         """
 
+        state_hash = self.state_hash()
+        if (
+            state_hash == getattr(self, "_state_hash", None)
+            and getattr(self, "l_mat", None) is not None
+            and self.alpha is not None
+        ):
+            return
+
         self.sync_data()
 
         ky_mat = get_Ky_mat(
@@ -822,18 +1017,21 @@ class GaussianProcess:
             n_sample=self.n_sample,
         )
 
-        l_mat = np.linalg.cholesky(ky_mat)
-        l_mat_inv = np.linalg.inv(l_mat)
-        ky_mat_inv = l_mat_inv.T @ l_mat_inv
-        alpha = np.matmul(ky_mat_inv, self.all_labels)
+        # keep the matrix that was factored, which includes any jitter
+        l_mat, ky_mat = jittered_cholesky_factor(
+            ky_mat, device=self.device, logger_name=self.logger_name
+        )
+        alpha = cholesky_solve(l_mat, self.all_labels)
 
         self.ky_mat = ky_mat
         self.l_mat = l_mat
         self.alpha = alpha
-        self.ky_mat_inv = ky_mat_inv
+        # the inverse is rebuilt from the new L on demand
+        self.ky_mat_inv = None
 
         self.likelihood = get_like_from_mats(ky_mat, l_mat, alpha, self.name)
         self.n_envs_prev = len(self.training_data)
+        self._state_hash = state_hash
 
     def update_L_alpha(self):
         """
@@ -846,6 +1044,16 @@ class GaussianProcess:
             self.set_L_alpha()
             return
 
+        # Nothing to do if no training data was added since the last update
+        size3 = len(self.training_data) * 3 + len(self.training_structures)
+        if (
+            self.alpha is not None
+            and self.alpha.shape[0] == size3
+            and self.ky_mat.shape[0] == size3
+            and self.n_envs_prev == len(self.training_data)
+        ):
+            return
+
         # Reset global variables.
         self.sync_data()
 
@@ -864,16 +1072,37 @@ class GaussianProcess:
             n_sample=self.n_sample,
         )
 
-        l_mat = np.linalg.cholesky(ky_mat)
-        l_mat_inv = np.linalg.inv(l_mat)
-        ky_mat_inv = l_mat_inv.T @ l_mat_inv
-        alpha = np.matmul(ky_mat_inv, self.all_labels)
+        # The old covariance matrix is the leading block of the new one
+        # unless force labels were added after earlier energy labels, in
+        # which case the new force rows are inserted in the middle.
+        n_strucs_prev = self.ky_mat.shape[0] - 3 * self.n_envs_prev
+        if self.l_mat.shape[0] == self.ky_mat.shape[0] and (
+            n_strucs_prev == 0 or len(self.training_data) == self.n_envs_prev
+        ):
+            try:
+                l_mat = update_l_mat(self.l_mat, ky_mat)
+            except np.linalg.LinAlgError:
+                l_mat = None
+        else:
+            l_mat = None
+
+        # factor the whole matrix, with a jitter if needed, when L cannot
+        # be extended
+        if l_mat is None:
+            l_mat, ky_mat = jittered_cholesky_factor(
+                ky_mat, device=self.device, logger_name=self.logger_name
+            )
+        alpha = cholesky_solve(l_mat, self.all_labels)
 
         self.ky_mat = ky_mat
         self.l_mat = l_mat
         self.alpha = alpha
-        self.ky_mat_inv = ky_mat_inv
+        # the inverse is rebuilt from the new L on demand
+        self.ky_mat_inv = None
         self.n_envs_prev = len(self.training_data)
+        # L was extended rather than recomputed, so set_L_alpha should not
+        # be skipped on the next call
+        self._state_hash = None
 
     def __str__(self):
         """String representation of the GP model."""
@@ -902,7 +1131,34 @@ class GaussianProcess:
 
         self.check_L_alpha()
 
-        out_dict = deepcopy(dict(vars(self)))
+        # Large arrays are stored by reference, the callables and the
+        # output object are skipped, and the training environments are
+        # serialized below, so only the small attributes are copied.
+        skipped = {
+            "kernel",
+            "kernel_grad",
+            "energy_kernel",
+            "energy_force_kernel",
+            "efs_energy_kernel",
+            "efs_force_kernel",
+            "efs_self_kernel",
+            "output",
+            "training_data",
+            "training_structures",
+            "_f32_mats",
+            "_state_hash",
+            "_last_opt_state",
+        }
+        out_dict = {}
+        for key, value in vars(self).items():
+            if key in skipped:
+                continue
+            if isinstance(value, np.ndarray):
+                out_dict[key] = value
+            else:
+                out_dict[key] = deepcopy(value)
+
+        out_dict["ky_mat_inv"] = out_dict.pop("_ky_mat_inv", None)
 
         out_dict["training_data"] = [env.as_dict() for env in self.training_data]
 
@@ -913,19 +1169,6 @@ class GaussianProcess:
             for env_curr in env_list:
                 out_dict["training_structures"][n].append(env_curr.as_dict())
 
-        # Remove the callables
-        for key in [
-            "kernel",
-            "kernel_grad",
-            "energy_kernel",
-            "energy_force_kernel",
-            "efs_energy_kernel",
-            "efs_force_kernel",
-            "efs_self_kernel",
-            "output",
-        ]:
-            out_dict.pop(key)
-
         return out_dict
 
     def sync_data(self):
@@ -974,7 +1217,23 @@ class GaussianProcess:
         new_gp.n_envs_prev = len(new_gp.training_data)
 
         # Save time by attempting to load in computed attributes
-        if dictionary.get("ky_mat_file"):
+        if dictionary.get("matrix_file"):
+            try:
+                with np.load(dictionary["matrix_file"]) as matrices:
+                    new_gp.ky_mat = matrices["ky_mat"]
+                    new_gp.l_mat = matrices["l_mat"]
+                    new_gp.alpha = matrices["alpha"]
+            except FileNotFoundError:
+                new_gp.ky_mat = None
+                new_gp.l_mat = None
+                new_gp.alpha = None
+                filename = dictionary.get("matrix_file")
+                logger = logging.getLogger(new_gp.logger_name)
+                logger.warning(
+                    "the covariance matrices are not loaded"
+                    f"because {filename} cannot be found"
+                )
+        elif dictionary.get("ky_mat_file"):
             try:
                 new_gp.ky_mat = np.load(dictionary["ky_mat_file"])
                 new_gp.compute_matrices()
@@ -1037,10 +1296,12 @@ class GaussianProcess:
             self.set_L_alpha()
 
         else:
-            self.l_mat = np.linalg.cholesky(ky_mat)
-            self.l_mat_inv = np.linalg.inv(self.l_mat)
-            self.ky_mat_inv = self.l_mat_inv.T @ self.l_mat_inv
-            self.alpha = np.matmul(self.ky_mat_inv, self.all_labels)
+            self.l_mat, self.ky_mat = jittered_cholesky_factor(
+                ky_mat, device=self.device, logger_name=self.logger_name
+            )
+            # the inverse is rebuilt from the new L on demand
+            self.ky_mat_inv = None
+            self.alpha = cholesky_solve(self.l_mat, self.all_labels)
 
     def adjust_cutoffs(
         self,
@@ -1094,6 +1355,11 @@ class GaussianProcess:
             self.training_data[i].setup_mask(hm)
             self.training_data[i].compute_env()
 
+        # the pool workers and the stacked training arrays hold copies of
+        # the old environments
+        close_pool(self.name)
+        _global_training_arrays.pop(self.name, None)
+
         # Ensure that training data and labels are still consistent
         self.sync_data()
 
@@ -1150,7 +1416,7 @@ class GaussianProcess:
             removed_data.append(self.training_data.pop(i))
             removed_labels.append(self.training_labels.pop(i))
 
-        self.training_labels_np = np.hstack(self.training_labels)
+        self.training_labels_np = self.force_list_to_np(self.training_labels)
         self.all_labels = np.concatenate(
             (self.training_labels_np, self.energy_labels_np)
         )
@@ -1174,15 +1440,45 @@ class GaussianProcess:
         across different versions of FLARE or GP implementations. However,
         they are larger and loading them in takes longer (by setting up a
         new GP from the specifications). Pickled files can be faster to
-        read & write, and they take up less memory.
+        read & write, and they take up less memory. The npz format writes
+        the covariance matrix, L and alpha to a compressed .npz file and
+        the rest of the model to a JSON file of the same name.
 
         Args:
             name (str): Output name.
-            format (str): Output format.
+            format (str): Output format (json, pickle, binary or npz).
             split_matrix_size_cutoff (int): If there are more than this
             number of training points in the set, save the matrices seperately.
         """
 
+        # Automatically detect output format from name variable
+
+        for detect in ["json", "pickle", "binary", "npz"]:
+            if detect in name.lower():
+                format = detect
+                break
+
+        if format is None:
+            format = "json"
+
+        if format.lower() == "npz":
+            if ".npz" == name[-4:]:
+                name = name[:-4]
+
+            self.check_L_alpha()
+            np.savez_compressed(
+                f"{name}.npz", ky_mat=self.ky_mat, l_mat=self.l_mat, alpha=self.alpha
+            )
+
+            out_dict = self.as_dict()
+            for key in ["ky_mat", "l_mat", "alpha", "ky_mat_inv"]:
+                out_dict[key] = None
+            out_dict["matrix_file"] = f"{name}.npz"
+
+            with open(f"{name}.json", "w") as f:
+                json.dump(out_dict, f, cls=NumpyEncoder)
+            return
+
         if len(self.training_data) > split_matrix_size_cutoff:
             np.save(f"{name}_ky_mat.npy", self.ky_mat)
             self.ky_mat_file = f"{name}_ky_mat.npy"
@@ -1190,24 +1486,14 @@ class GaussianProcess:
             temp_ky_mat = self.ky_mat
             temp_l_mat = self.l_mat
             temp_alpha = self.alpha
-            temp_ky_mat_inv = self.ky_mat_inv
+            temp_ky_mat_inv = self._ky_mat_inv
 
             self.ky_mat = None
             self.l_mat = None
             self.alpha = None
             self.ky_mat_inv = None
 
-        # Automatically detect output format from name variable
-
-        for detect in ["json", "pickle", "binary"]:
-            if detect in name.lower():
-                format = detect
-                break
-
-        if format is None:
-            format = "json"
-
-        supported_formats = ["json", "pickle", "binary"]
+        supported_formats = ["json", "pickle", "binary", "npz"]
 
         if format.lower() == "json":
             if ".json" != name[-5:]:
@@ -1244,7 +1530,17 @@ class GaussianProcess:
         :return:
         """
 
-        if ".json" in filename or "json" in format:
+        if ".npz" in filename or "npz" in format:
+            # the rest of the model is in the JSON file written next to the
+            # matrices, as in write_model
+            if ".npz" == filename[-4:]:
+                filename = filename[:-4]
+            if ".json" != filename[-5:]:
+                filename += ".json"
+            with open(filename, "r") as f:
+                gp_model = GaussianProcess.from_dict(json.loads(f.readline()))
+
+        elif ".json" in filename or "json" in format:
             with open(filename, "r") as f:
                 gp_model = GaussianProcess.from_dict(json.loads(f.readline()))
 
@@ -1318,6 +1614,8 @@ class GaussianProcess:
     def __del__(self):
         if self is None:
             return
+        close_pool(self.name)
+        _global_training_arrays.pop(self.name, None)
         if self.name in _global_training_labels:
             return (
                 _global_training_data.pop(self.name, None),
@@ -1389,6 +1687,27 @@ class GaussianProcess:
         if "energy_noise" not in dictionary:
             dictionary["energy_noise"] = 0.01
 
+        if "precision" not in dictionary:
+            dictionary["precision"] = "f64"
+
+        # the inverse of L is no longer stored
+        dictionary.pop("l_mat_inv", None)
+
+        # the covariance matrix is no longer factored block by block
+        dictionary.pop("block_size", None)
+
+        if "device" not in dictionary:
+            dictionary["device"] = "cpu"
+
+        if "maxcor" not in dictionary:
+            dictionary["maxcor"] = 10
+        if "hyps_tol" not in dictionary:
+            dictionary["hyps_tol"] = None
+        if "retrain_fraction" not in dictionary:
+            dictionary["retrain_fraction"] = 0.1
+        if "_last_opt_state" not in dictionary:
+            dictionary["_last_opt_state"] = None
+
         if not isinstance(dictionary["cutoffs"], dict):
             dictionary["cutoffs"] = Parameters.cutoff_array_to_dict(
                 dictionary["cutoffs"]
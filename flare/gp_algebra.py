@@ -1,16 +1,36 @@
 import logging
 import math
 import multiprocessing as mp
+import numba
 import numpy as np
 import time
 
+from contextlib import contextmanager
+from scipy.linalg import solve_triangular
+from scipy.linalg.lapack import dpotrf, dpotri, dpotrs
 from typing import List, Callable
-from flare.kernels.utils import from_mask_to_args, from_grad_to_mask
+from flare.kernels.utils import (
+    from_mask_to_args,
+    from_grad_to_mask,
+    kernel_to_force_vector,
+    kernel_to_force_block,
+    kernel_to_grad_block,
+)
+
+try:
+    # Used to factor large covariance matrices on the GPU
+    import cupy as cp
+
+    _cupy_present = True
+except ImportError:
+    _cupy_present = False
 
 _global_training_data = {}
 _global_training_labels = {}
 _global_training_structures = {}
 _global_energy_labels = {}
+_global_pools = {}
+_global_training_arrays = {}
 
 
 def queue_wrapper(result_queue, wid, func, args):
@@ -145,7 +165,8 @@ def partition_force_energy_block(n_sample: int, size1: int, size2: int, n_cpus:
 
 def partition_update(n_sample, size, old_size, n_cpus):
 
-    n_unique_elements = (size - old_size) * size
+    n_new = size - old_size
+    n_unique_elements = n_new * old_size + n_new * (n_new + 1) / 2
     n_sample0 = int(math.ceil(np.sqrt(n_unique_elements / n_cpus)))
     if n_sample0 > n_sample:
         n_sample = n_sample0
@@ -165,11 +186,13 @@ def partition_update(n_sample, size, old_size, n_cpus):
             block_id += [(s1, e1, s2, e2)]
             nbatch += 1
 
+    # the new/new square is symmetric: only blocks on or above the diagonal
+    # are computed, and parallel_matrix_construction mirrors the rest
     for ibatch1 in range(ns_new):
         s1 = int(n_sample * ibatch1) + old_size
         e1 = int(np.min([s1 + n_sample, size]))
 
-        for ibatch2 in range(ns_new):
+        for ibatch2 in range(ibatch1, ns_new):
             s2 = int(n_sample * ibatch2) + old_size
             e2 = int(np.min([s2 + n_sample, size]))
             block_id += [(s1, e1, s2, e2)]
@@ -178,6 +201,18 @@ def partition_update(n_sample, size, old_size, n_cpus):
     return block_id, nbatch
 
 
+def force_indices(s, e):
+    """
+    environment index and force component (1, 2 or 3) of each row of a
+    force block spanning training environments s to e
+    """
+
+    env_inds = np.repeat(np.arange(s, e), 3).tolist()
+    ds = np.tile([1, 2, 3], e - s).tolist()
+
+    return env_inds, ds
+
+
 def obtain_noise_len(hyps, hyps_mask):
     """
     obtain the noise parameter from hyps and mask
@@ -197,11 +232,110 @@ def obtain_noise_len(hyps, hyps_mask):
     return sigma_n, non_noise_hyps, train_noise
 
 
+@contextmanager
+def numba_threads(n_threads):
+    """
+    Limit the Numba threading layer to n_threads within the context.
+    """
+
+    previous = numba.get_num_threads()
+    numba.set_num_threads(max(1, min(n_threads, numba.config.NUMBA_NUM_THREADS)))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+def call_block_kernel(block_kernel, arrays_1, arrays_2, same, args, n_threads=1):
+    """
+    Evaluate a block kernel on two sets of stacked environments, with at
+    most n_threads Numba threads. With one thread the single-threaded build
+    of the kernel is used, which is the only one that is safe to call in a
+    forked worker process.
+    """
+
+    if n_threads == 1:
+        return block_kernel(arrays_1, arrays_2, same, *args)
+
+    with numba_threads(n_threads):
+        return block_kernel(arrays_1, arrays_2, same, *args, parallel=True)
+
+
+def get_training_arrays(name, stack_function, s, e):
+    """
+    Return the stacked arrays of training environments s to e.
+
+    The arrays of the whole training set are built once with stack_function
+    and cached under name, so that the kernel matrix blocks can slice them
+    instead of stacking the environments again. The cache is rebuilt when
+    the training environments stored under name change; code that modifies
+    the environments in place must drop _global_training_arrays[name].
+    """
+
+    training_data = _global_training_data[name]
+    cache = _global_training_arrays.setdefault(name, {})
+
+    cached = cache.get(stack_function)
+    if (
+        cached is None
+        or len(cached[0]) != len(training_data)
+        or not all(a is b for a, b in zip(cached[0], training_data))
+    ):
+        cached = (list(training_data), stack_function(training_data))
+        cache[stack_function] = cached
+
+    return tuple(array[s:e] for array in cached[1])
+
+
 # --------------------------------------------------------------------------
 #                   Parallel matrix/vector construction
 # --------------------------------------------------------------------------
 
 
+def get_pool(name, n_cpus):
+    """
+    Return a persistent process pool for the training set stored under name.
+
+    The workers are forked with a copy of the global training data, so the
+    pool is only reused while the same training data is registered under
+    name; otherwise it is replaced by a fresh one.
+    """
+
+    data = (
+        _global_training_data.get(name),
+        _global_training_structures.get(name),
+        _global_training_labels.get(name),
+        _global_energy_labels.get(name),
+    )
+    sizes = tuple(0 if d is None else len(d) for d in data)
+
+    if name in _global_pools:
+        pool, pool_cpus, pool_data, pool_sizes = _global_pools[name]
+        if (
+            pool_cpus == n_cpus
+            and pool_sizes == sizes
+            and all(a is b for a, b in zip(pool_data, data))
+        ):
+            return pool
+        close_pool(name)
+
+    pool = mp.Pool(n_cpus)
+    _global_pools[name] = (pool, n_cpus, data, sizes)
+
+    return pool
+
+
+def close_pool(name):
+    """
+    Shut down the process pool of the training set stored under name.
+    """
+
+    if name in _global_pools:
+        pool = _global_pools.pop(name)[0]
+        pool.terminate()
+        pool.join()
+
+
 def parallel_matrix_construction(
     pack_function,
     hyps,
@@ -272,39 +406,24 @@ def parallel_vector_construction(
     size,
     mult,
     d_1=None,
+    n_cpus=None,
 ):
-    result_queue = mp.Queue()
-    children = []
-    for wid in range(nbatch):
-        s, e = block_id[wid]
-        children.append(
-            mp.Process(
-                target=queue_wrapper,
-                args=(
-                    result_queue,
-                    wid,
-                    pack_function,
-                    (name, s, e, x, kernel, hyps, cutoffs, hyps_mask, d_1),
-                ),
-            )
-        )
-
-    # Run child processes.
-    for c in children:
-        c.start()
+    if n_cpus is None:
+        n_cpus = nbatch
+    pool = get_pool(name, n_cpus)
 
-    # Wait for all results to arrive.
-    vector = np.zeros(size * mult)
-    for _ in range(nbatch):
-        wid, result_chunk = result_queue.get(block=True)
-        s, e = block_id[wid]
-        vector[s * mult : e * mult] = result_chunk
+    # Each task covers a block of training environments.
+    args = [
+        (name, s, e, x, kernel, hyps, cutoffs, hyps_mask, d_1) for s, e in block_id
+    ]
+    results = pool.starmap(pack_function, args)
 
-    # Join child processes (clean up zombies).
-    for c in children:
-        c.join()
+    # The blocks are contiguous and ordered, so the chunks are joined in a
+    # single copy.
+    if len(results) == 0:
+        return np.zeros(size * mult)
 
-    return vector
+    return np.concatenate(results)
 
 
 def multiple_array_construction(
@@ -320,45 +439,26 @@ def multiple_array_construction(
     size,
     mult,
     array_sizes,
+    n_cpus=None,
 ):
-    result_queue = mp.Queue()
-    children = []
-    for wid in range(nbatch):
-        s, e = block_id[wid]
-        children.append(
-            mp.Process(
-                target=queue_wrapper,
-                args=(
-                    result_queue,
-                    wid,
-                    pack_function,
-                    (name, s, e, x, kernel, hyps, cutoffs, hyps_mask),
-                ),
-            )
-        )
+    if n_cpus is None:
+        n_cpus = nbatch
+    pool = get_pool(name, n_cpus)
 
-    # Run child processes.
-    for c in children:
-        c.start()
+    # Each task covers a block of training environments.
+    args = [(name, s, e, x, kernel, hyps, cutoffs, hyps_mask) for s, e in block_id]
+    results = pool.starmap(pack_function, args)
 
-    # Initialize arrays.
+    # The blocks are contiguous and ordered, so the chunks of each array are
+    # joined in a single copy.
     n_arrays = len(array_sizes)
-    arrays = []
-    for n in range(n_arrays):
-        arrays.append(np.zeros(array_sizes[n]))
-
-    # Wait for all results to arrive.
-    for _ in range(nbatch):
-        wid, result_chunk = result_queue.get(block=True)
-        s, e = block_id[wid]
-        for n in range(n_arrays):
-            arrays[n][:, s * mult : e * mult] = result_chunk[n]
-
-    # Join child processes (clean up zombies).
-    for c in children:
-        c.join()
+    if len(results) == 0:
+        return [np.zeros(array_sizes[n]) for n in range(n_arrays)]
 
-    return arrays
+    return [
+        np.concatenate([result_chunk[n] for result_chunk in results], axis=1)
+        for n in range(n_arrays)
+    ]
 
 
 # --------------------------------------------------------------------------
@@ -477,6 +577,7 @@ def get_force_block_pack(
     kernel,
     cutoffs,
     hyps_mask,
+    n_threads=1,
 ):
     """Compute covariance matrix element between set1 and set2
     :param hyps: list of hyper-parameters
@@ -486,6 +587,8 @@ def get_force_block_pack(
     :param cutoffs: The cutoff values used for the atomic environments
     :type cutoffs: list of 2 float numbers
     :param hyps_mask: dictionary used for multi-group hyperparmeters
+    :param n_threads: number of Numba threads the block kernel may use,
+        which must be 1 in forked worker processes
 
     :return: covariance matrix
     """
@@ -496,21 +599,32 @@ def get_force_block_pack(
     size2 = (e2 - s2) * 3
     force_block = np.zeros([size1, size2])
 
-    ds = [1, 2, 3]
+    env_inds_1, ds_1 = force_indices(s1, e1)
+    env_inds_2, ds_2 = force_indices(s2, e2)
 
     # calculate elements
     args = from_mask_to_args(hyps, cutoffs, hyps_mask)
 
+    # evaluate the whole block in compiled code if the kernel supports it
+    force_block_kernel = kernel_to_force_block(kernel)
+    if force_block_kernel is not None:
+        block_kernel, stack_function = force_block_kernel
+        arrays_1 = get_training_arrays(name, stack_function, s1, e1)
+        arrays_2 = get_training_arrays(name, stack_function, s2, e2)
+        return call_block_kernel(
+            block_kernel, arrays_1, arrays_2, same, args, n_threads
+        )
+
     for m_index in range(size1):
-        x_1 = training_data[int(math.floor(m_index / 3)) + s1]
-        d_1 = ds[m_index % 3]
+        x_1 = training_data[env_inds_1[m_index]]
+        d_1 = ds_1[m_index]
         if same:
             lowbound = m_index
         else:
             lowbound = 0
         for n_index in range(lowbound, size2):
-            x_2 = training_data[int(math.floor(n_index / 3)) + s2]
-            d_2 = ds[n_index % 3]
+            x_2 = training_data[env_inds_2[n_index]]
+            d_2 = ds_2[n_index]
             kern_curr = kernel(x_1, x_2, d_1, d_2, *args)
             # store kernel value
             force_block[m_index, n_index] = kern_curr
@@ -586,14 +700,14 @@ def get_force_energy_block_pack(
     size2 = e2 - s2
     force_energy_block = np.zeros([size1, size2])
 
-    ds = [1, 2, 3]
+    env_inds, ds = force_indices(s1, e1)
 
     # calculate elements
     args = from_mask_to_args(hyps, cutoffs, hyps_mask)
 
     for m_index in range(size1):
-        environment_1 = training_data[int(math.floor(m_index / 3)) + s1]
-        d_1 = ds[m_index % 3]
+        environment_1 = training_data[env_inds[m_index]]
+        d_1 = ds[m_index]
 
         for n_index in range(size2):
             structure = training_structures[n_index + s2]
@@ -635,9 +749,22 @@ def get_force_block(
 
     if n_cpus is None:
         n_cpus = mp.cpu_count()
-    if n_cpus == 1:
+
+    # kernels with a block version run on n_cpus Numba threads in this
+    # process instead of forking
+    if n_cpus == 1 or kernel_to_force_block(kernel) is not None:
         k_mat = get_force_block_pack(
-            hyps, name, 0, size, 0, size, True, kernel, cutoffs, hyps_mask
+            hyps,
+            name,
+            0,
+            size,
+            0,
+            size,
+            True,
+            kernel,
+            cutoffs,
+            hyps_mask,
+            n_threads=n_cpus,
         )
     else:
         # initialize matrices
@@ -824,14 +951,41 @@ def update_force_block(
     if n_cpus is None:
         n_cpus = mp.cpu_count()
 
-    # serial version
-    if n_cpus == 1:
+    # serial version, or Numba threads for kernels with a block version
+    if n_cpus == 1 or kernel_to_force_block(kernel) is not None:
         force_block = np.zeros((size3, size3))
-        new_mat = get_force_block_pack(
-            hyps, name, 0, size, old_size, size, False, kernel, cutoffs, hyps_mask
+
+        # old/new rectangle, mirrored into the lower triangle
+        old_new = get_force_block_pack(
+            hyps,
+            name,
+            0,
+            old_size,
+            old_size,
+            size,
+            False,
+            kernel,
+            cutoffs,
+            hyps_mask,
+            n_threads=n_cpus,
+        )
+        force_block[:old_size3, old_size3:] = old_new
+        force_block[old_size3:, :old_size3] = old_new.transpose()
+
+        # new/new square is symmetric, so only its upper triangle is computed
+        force_block[old_size3:, old_size3:] = get_force_block_pack(
+            hyps,
+            name,
+            old_size,
+            size,
+            old_size,
+            size,
+            True,
+            kernel,
+            cutoffs,
+            hyps_mask,
+            n_threads=n_cpus,
         )
-        force_block[:, old_size3:] = new_mat
-        force_block[old_size3:, :] = new_mat.transpose()
 
     # parallel version
     else:
@@ -885,11 +1039,18 @@ def update_energy_block(
     # serial version
     if n_cpus == 1:
         energy_block = np.zeros((size, size))
-        new_mat = get_energy_block_pack(
-            hyps, name, 0, size, old_size, size, False, kernel, cutoffs, hyps_mask
+
+        # old/new rectangle, mirrored into the lower triangle
+        old_new = get_energy_block_pack(
+            hyps, name, 0, old_size, old_size, size, False, kernel, cutoffs, hyps_mask
+        )
+        energy_block[:old_size, old_size:] = old_new
+        energy_block[old_size:, :old_size] = old_new.transpose()
+
+        # new/new square is symmetric, so only its upper triangle is computed
+        energy_block[old_size:, old_size:] = get_energy_block_pack(
+            hyps, name, old_size, size, old_size, size, True, kernel, cutoffs, hyps_mask
         )
-        energy_block[:, old_size:] = new_mat
-        energy_block[old_size:, :] = new_mat.transpose()
 
     # parallel version
     else:
@@ -1098,6 +1259,217 @@ def get_ky_mat_update(
     return ky_mat
 
 
+def cholesky_factor(
+    ky_mat: np.ndarray, block_size: int = None, device="cpu", overwrite=False
+):
+    """Lower triangular Cholesky factor of a covariance matrix, computed
+    with LAPACK dpotrf directly to skip the checks and extra copies of the
+    higher level wrappers.
+
+    :param ky_mat: symmetric positive definite matrix
+    :param block_size: if given and smaller than the matrix, factor the
+        matrix block by block with blocked_cholesky
+    :param device: "gpu" to factor the matrix with gpu_cholesky
+    :param overwrite: if True, the factor may be written over ky_mat
+        instead of a new array (CPU only)
+    :return: lower triangular Cholesky factor
+    :raises np.linalg.LinAlgError: if ky_mat is not positive definite
+    """
+
+    if device == "gpu":
+        return gpu_cholesky(ky_mat)
+
+    if block_size is not None and block_size < ky_mat.shape[0]:
+        return blocked_cholesky(ky_mat, block_size, overwrite)
+
+    l_mat, info = dpotrf(ky_mat, lower=1, clean=1, overwrite_a=overwrite)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"Cholesky factorization failed (info={info})")
+
+    return l_mat
+
+
+def jittered_cholesky_factor(
+    ky_mat: np.ndarray,
+    block_size: int = None,
+    device="cpu",
+    jitters=(1e-10, 1e-8, 1e-6),
+    logger_name: str = None,
+):
+    """Lower triangular Cholesky factor of a covariance matrix. If ky_mat is
+    not numerically positive definite, increasing multiples of its mean
+    diagonal are added to the diagonal of a copy of ky_mat until the
+    factorization succeeds.
+
+    :param ky_mat: symmetric matrix
+    :param block_size: passed to cholesky_factor
+    :param device: passed to cholesky_factor
+    :param jitters: relative jitters tried in order
+    :param logger_name: name of the logger used to report the jitter
+    :return: lower triangular Cholesky factor, and the matrix that was
+        factored (ky_mat itself if no jitter was needed)
+    :raises np.linalg.LinAlgError: if all jitters fail
+    """
+
+    try:
+        return cholesky_factor(ky_mat, block_size, device), ky_mat
+    except np.linalg.LinAlgError as error:
+        last_error = error
+
+    scale = np.mean(np.diagonal(ky_mat))
+    jittered_mat = np.array(ky_mat, dtype=np.float64)
+    diagonal = np.diagonal(ky_mat).copy()
+    for jitter in jitters:
+        np.fill_diagonal(jittered_mat, diagonal + jitter * scale)
+        try:
+            l_mat = cholesky_factor(jittered_mat, block_size, device)
+        except np.linalg.LinAlgError as error:
+            last_error = error
+            continue
+
+        logger = logging.getLogger(logger_name)
+        logger.warning(
+            "Ky is not positive definite, a jitter of "
+            f"{jitter * scale} was added to its diagonal"
+        )
+        return l_mat, jittered_mat
+
+    raise last_error
+
+
+def blocked_cholesky(ky_mat: np.ndarray, block_size: int, overwrite=False):
+    """Left-looking blocked Cholesky factorization. Each column block j is
+    updated with the blocks to its left (one matrix product), its diagonal
+    block is factored with dpotrf, and the rows below it are found with a
+    triangular solve.
+
+    The factor is written over ky_mat if overwrite is True and into a new
+    n x n array otherwise, in which case ky_mat is only read one block of
+    columns at a time. Besides the factor, the working memory is
+    O(n * block_size), so a memory-mapped ky_mat can be factored in place
+    without loading it whole.
+
+    :param ky_mat: symmetric positive definite matrix, only its lower
+        triangle is read
+    :param block_size: number of columns per block
+    :param overwrite: if True, factor ky_mat in place
+    :return: lower triangular Cholesky factor
+    :raises np.linalg.LinAlgError: if ky_mat is not positive definite
+    :raises ValueError: if block_size is not positive
+    """
+
+    if block_size < 1:
+        raise ValueError("block_size should be a positive integer")
+
+    size = ky_mat.shape[0]
+    l_mat = ky_mat if overwrite else np.empty_like(ky_mat, dtype=np.float64)
+
+    for s in range(0, size, block_size):
+        e = min(s + block_size, size)
+
+        if not overwrite:
+            l_mat[s:, s:e] = ky_mat[s:, s:e]
+        l_mat[:s, s:e] = 0
+
+        if s > 0:
+            l_mat[s:, s:e] -= np.matmul(l_mat[s:, :s], l_mat[s:e, :s].T)
+
+        l_diag, info = dpotrf(l_mat[s:e, s:e], lower=1, clean=1)
+        if info != 0:
+            raise np.linalg.LinAlgError(
+                f"Cholesky factorization failed (info={info + s})"
+            )
+        l_mat[s:e, s:e] = l_diag
+
+        if e < size:
+            l_mat[e:, s:e] = solve_triangular(l_diag, l_mat[e:, s:e].T, lower=True).T
+
+    return l_mat
+
+
+def gpu_cholesky(ky_mat: np.ndarray):
+    """Lower triangular Cholesky factor of a covariance matrix computed on
+    the GPU with CuPy. The factor is copied back to the host.
+
+    :param ky_mat: symmetric positive definite matrix
+    :return: lower triangular Cholesky factor
+    :raises np.linalg.LinAlgError: if ky_mat is not positive definite
+    """
+
+    if not _cupy_present:
+        raise ImportError("CuPy is required to factor Ky on the GPU")
+
+    l_mat = cp.asnumpy(cp.linalg.cholesky(cp.asarray(ky_mat)))
+
+    # cuSOLVER may return NaNs instead of failing for indefinite matrices
+    if not np.all(np.isfinite(np.diagonal(l_mat))):
+        raise np.linalg.LinAlgError("Cholesky factorization failed on the GPU")
+
+    return l_mat
+
+
+def cholesky_solve(l_mat: np.ndarray, b: np.ndarray):
+    """Solve ky_mat x = b given the lower Cholesky factor of ky_mat.
+
+    :param l_mat: lower triangular Cholesky factor
+    :param b: right hand side
+    :return: x
+    """
+
+    x, info = dpotrs(l_mat, b, lower=1)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"Cholesky solve failed (info={info})")
+
+    return x
+
+
+def cholesky_inverse(l_mat: np.ndarray):
+    """Inverse of ky_mat given its lower Cholesky factor.
+
+    :param l_mat: lower triangular Cholesky factor
+    :return: inverse of ky_mat
+    """
+
+    inv, info = dpotri(l_mat, lower=1)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"Cholesky inversion failed (info={info})")
+
+    # dpotri only fills the lower triangle
+    return np.tril(inv) + np.tril(inv, -1).T
+
+
+def update_l_mat(l_mat_old: np.ndarray, ky_mat: np.ndarray):
+    """Extend the Cholesky factor of the leading block of a covariance
+    matrix to the whole matrix.
+
+    Writing ky_mat = [[K, B], [B^T, D]] with L L^T = K, the new factor is
+    [[L, 0], [L21, L22]], where L21 = (L^-1 B)^T and L22 is the Cholesky
+    factor of D - L21 L21^T. This costs one triangular solve and a small
+    factorization instead of factoring the full matrix again.
+
+    :param l_mat_old: lower triangular Cholesky factor of the leading block
+    :param ky_mat: the updated covariance matrix
+    :return: lower triangular Cholesky factor of ky_mat
+    """
+
+    old_size = l_mat_old.shape[0]
+    size = ky_mat.shape[0]
+
+    l_mat = np.zeros((size, size))
+    l_mat[:old_size, :old_size] = l_mat_old
+
+    if size == old_size:
+        return l_mat
+
+    l_21 = solve_triangular(l_mat_old, ky_mat[:old_size, old_size:], lower=True).T
+    s_mat = ky_mat[old_size:, old_size:] - np.matmul(l_21, l_21.T)
+
+    l_mat[old_size:, :old_size] = l_21
+    l_mat[old_size:, old_size:] = cholesky_factor(s_mat)
+
+    return l_mat
+
+
 # --------------------------------------------------------------------------
 #                            Kernel vectors
 # --------------------------------------------------------------------------
@@ -1139,7 +1511,7 @@ def energy_force_vector_unit(
 
     training_data = _global_training_data[name]
 
-    ds = [1, 2, 3]
+    env_inds, ds = force_indices(s, e)
     size = (e - s) * 3
     k_v = np.zeros(
         size,
@@ -1148,8 +1520,8 @@ def energy_force_vector_unit(
     args = from_mask_to_args(hyps, cutoffs, hyps_mask)
 
     for m_index in range(size):
-        x_2 = training_data[int(math.floor(m_index / 3)) + s]
-        d_2 = ds[m_index % 3]
+        x_2 = training_data[env_inds[m_index]]
+        d_2 = ds[m_index]
         k_v[m_index] = kernel(x_2, x, d_2, *args)
 
     return k_v
@@ -1191,6 +1563,14 @@ def force_force_vector_unit(name, s, e, x, kernel, hyps, cutoffs, hyps_mask, d_1
 
     args = from_mask_to_args(hyps, cutoffs, hyps_mask)
 
+    # evaluate all three force components of each environment in one call
+    # if the kernel supports it
+    force_vector_kernel = kernel_to_force_vector(kernel)
+    if force_vector_kernel is not None:
+        vector_kernel, stack_function = force_vector_kernel
+        arrays = get_training_arrays(name, stack_function, s, e)
+        return vector_kernel(x, arrays, d_1, *args)
+
     k_v = np.zeros(size * 3)
 
     for m_index in range(size):
@@ -1290,6 +1670,7 @@ def energy_energy_vector(
         nbatch,
         size,
         mult,
+        n_cpus=n_cpus,
     )
 
     return force_energy_vector
@@ -1329,6 +1710,7 @@ def energy_force_vector(
         nbatch,
         size,
         mult,
+        n_cpus=n_cpus,
     )
 
     return k12_v
@@ -1368,6 +1750,7 @@ def force_energy_vector(
         size,
         mult,
         d_1,
+        n_cpus=n_cpus,
     )
 
     return force_energy_vector
@@ -1390,6 +1773,12 @@ def force_force_vector(
             name, 0, size, x, kernel, hyps, cutoffs, hyps_mask, d_1
         )
 
+    # stack the training environments before the pool is forked, so that
+    # the workers share the cached arrays
+    force_vector_kernel = kernel_to_force_vector(kernel)
+    if force_vector_kernel is not None:
+        get_training_arrays(name, force_vector_kernel[1], 0, 0)
+
     block_id, nbatch = partition_vector(n_sample, size, n_cpus)
     pack_function = force_force_vector_unit
     mult = 3
@@ -1407,6 +1796,7 @@ def force_force_vector(
         size,
         mult,
         d_1,
+        n_cpus=n_cpus,
     )
 
     return k12_v
@@ -1459,6 +1849,7 @@ def efs_force_vector(
         size,
         mult,
         array_sizes,
+        n_cpus=n_cpus,
     )
 
     return efs_arrays
@@ -1510,6 +1901,7 @@ def efs_energy_vector(
         size,
         mult,
         array_sizes,
+        n_cpus=n_cpus,
     )
 
     return efs_arrays
@@ -1631,6 +2023,7 @@ def get_ky_and_hyp_pack(
     kernel_grad,
     cutoffs=None,
     hyps_mask=None,
+    n_threads=1,
 ):
     """
     computes a block of ky matrix and its derivative to hyper-parameter
@@ -1642,6 +2035,8 @@ def get_ky_and_hyp_pack(
     :param cutoffs: The cutoff values used for the atomic environments
     :type cutoffs: list of 2 float numbers
     :param hyps_mask: dictionary used for multi-group hyperparmeters
+    :param n_threads: number of Numba threads the block kernel may use,
+        which must be 1 in forked worker processes
 
     :return: hyp_mat, ky_mat
     """
@@ -1657,21 +2052,33 @@ def get_ky_and_hyp_pack(
 
     args = from_mask_to_args(hyps, cutoffs, hyps_mask)
 
-    ds = [1, 2, 3]
+    # evaluate the whole block in compiled code if the kernel supports it
+    grad_block_kernel = kernel_to_grad_block(kernel_grad)
+    if grad_block_kernel is not None:
+        block_kernel, stack_function = grad_block_kernel
+        arrays_1 = get_training_arrays(name, stack_function, s1, e1)
+        arrays_2 = get_training_arrays(name, stack_function, s2, e2)
+        k_mat, hyp_mat = call_block_kernel(
+            block_kernel, arrays_1, arrays_2, same, args, n_threads
+        )
+        return from_grad_to_mask(hyp_mat, hyps_mask), k_mat
+
+    env_inds_1, ds_1 = force_indices(s1, e1)
+    env_inds_2, ds_2 = force_indices(s2, e2)
 
     training_data = _global_training_data[name]
     # calculate elements
     for m_index in range(size1):
-        x_1 = training_data[int(math.floor(m_index / 3)) + s1]
-        d_1 = ds[m_index % 3]
+        x_1 = training_data[env_inds_1[m_index]]
+        d_1 = ds_1[m_index]
 
         if same:
             lowbound = m_index
         else:
             lowbound = 0
         for n_index in range(lowbound, size2):
-            x_2 = training_data[int(math.floor(n_index / 3)) + s2]
-            d_2 = ds[n_index % 3]
+            x_2 = training_data[env_inds_2[n_index]]
+            d_2 = ds_2[n_index]
 
             # calculate kernel and gradient
             cov = kernel_grad(x_1, x_2, d_1, d_2, *args)
@@ -1720,9 +2127,22 @@ def get_ky_and_hyp(
 
     if n_cpus is None:
         n_cpus = mp.cpu_count()
-    if n_cpus == 1:
+
+    # kernels with a block version run on n_cpus Numba threads in this
+    # process instead of forking
+    if n_cpus == 1 or kernel_to_grad_block(kernel_grad) is not None:
         hyp_mat0, k_mat = get_ky_and_hyp_pack(
-            name, 0, size, 0, size, True, hyps, kernel_grad, cutoffs, hyps_mask
+            name,
+            0,
+            size,
+            0,
+            size,
+            True,
+            hyps,
+            kernel_grad,
+            cutoffs,
+            hyps_mask,
+            n_threads=n_cpus,
         )
     else:
 
@@ -1769,8 +2189,9 @@ def get_ky_and_hyp(
             hyp_mat0[:, s1 * 3 : e1 * 3, s2 * 3 : e2 * 3] = h_mat_block
             if s1 != s2:
                 k_mat[s2 * 3 : e2 * 3, s1 * 3 : e1 * 3] = k_mat_block.T
-                for idx in range(hyp_mat0.shape[0]):
-                    hyp_mat0[idx, s2 * 3 : e2 * 3, s1 * 3 : e1 * 3] = h_mat_block[idx].T
+                hyp_mat0[:, s2 * 3 : e2 * 3, s1 * 3 : e1 * 3] = h_mat_block.transpose(
+                    0, 2, 1
+                )
 
         # Join child processes (clean up zombies).
         for c in children:
@@ -1864,15 +2285,14 @@ def get_neg_like(
 
     # catch linear algebra errors
     try:
-        ky_mat_inv = np.linalg.inv(ky_mat)
-        l_mat = np.linalg.cholesky(ky_mat)
+        l_mat = cholesky_factor(ky_mat)
     except np.linalg.LinAlgError:
         number_of_hyps = len(hyps)
         return -1e8, np.zeros(number_of_hyps)
 
     labels = _global_training_labels[name]
 
-    alpha = np.matmul(ky_mat_inv, labels)
+    alpha = cholesky_solve(l_mat, labels)
 
     like = get_like_from_mats(ky_mat,l_mat,alpha,name)
 
@@ -1957,16 +2377,15 @@ def get_like_grad_from_mats(ky_mat, hyp_mat, name):
 
     # catch linear algebra errors
     try:
-        ky_mat_inv = np.linalg.inv(ky_mat)
-        l_mat = np.linalg.cholesky(ky_mat)
+        l_mat = cholesky_factor(ky_mat)
+        ky_mat_inv = cholesky_inverse(l_mat)
     except np.linalg.LinAlgError:
         return -1e8, np.zeros(number_of_hyps)
 
     labels = _global_training_labels[name]
 
-    alpha = np.matmul(ky_mat_inv, labels)
-    alpha_mat = np.matmul(alpha.reshape(-1, 1), alpha.reshape(1, -1))
-    like_mat = alpha_mat - ky_mat_inv
+    alpha = cholesky_solve(l_mat, labels)
+    like_mat = np.outer(alpha, alpha) - ky_mat_inv
 
     # calculate likelihood
     like = (
@@ -1975,9 +2394,9 @@ def get_like_grad_from_mats(ky_mat, hyp_mat, name):
         - math.log(2 * np.pi) * ky_mat.shape[1] / 2
     )
 
-    # calculate likelihood gradient
-    like_grad = np.zeros(number_of_hyps)
-    for n in range(number_of_hyps):
-        like_grad[n] = 0.5 * np.trace(np.matmul(like_mat, hyp_mat[n, :, :]))
+    # calculate likelihood gradient. The trace of a matrix product only
+    # needs the elementwise product, so each component is an O(n^2)
+    # contraction rather than an O(n^3) matrix multiplication.
+    like_grad = 0.5 * np.einsum("ij,nji->n", like_mat, hyp_mat)
 
     return like, like_grad
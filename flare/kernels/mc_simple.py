@@ -1,7 +1,7 @@
 """Multi-element 2-, 3-, and 2+3-body kernels that restrict all signal
 variance hyperparameters to a single value."""
 import numpy as np
-from numba import njit
+from numba import njit, prange
 from math import exp
 import sys
 import os
@@ -112,6 +112,37 @@ def two_plus_three_body_mc(
     return two_term + three_term
 
 
+def two_plus_three_body_mc_vector(
+    env1: AtomicEnvironment,
+    arrays2: tuple,
+    d1: int,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+) -> "ndarray":
+    """2+3-body multi-element kernel between a force component of one
+    environment and all three force components of a set of environments.
+
+    Args:
+        env1 (AtomicEnvironment): First local environment.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_plus_three_body_arrays.
+        d1 (int): Force component of the first environment.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig1, ls1,
+            sig2, ls2, sig_n).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+
+    Return:
+        np.ndarray: Kernel values, with entry 3 * i + d2 - 1 set to the
+            kernel between env1 and component d2 of environment i.
+    """
+
+    return two_body_mc_vector(
+        env1, arrays2[:4], d1, hyps[0:2], cutoffs, cutoff_func
+    ) + three_body_mc_vector(env1, arrays2[4:], d1, hyps[2:4], cutoffs, cutoff_func)
+
+
 def two_plus_three_body_mc_grad(
     env1: AtomicEnvironment,
     env2: AtomicEnvironment,
@@ -1320,6 +1351,50 @@ def three_body_mc(
     )
 
 
+def three_body_mc_vector(
+    env1: AtomicEnvironment,
+    arrays2: tuple,
+    d1: int,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+) -> "ndarray":
+    """3-body multi-element kernel between a force component of one
+    environment and all three force components of a set of environments.
+
+    Args:
+        env1 (AtomicEnvironment): First local environment.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_three_body_arrays.
+        d1 (int): Force component of the first environment.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+
+    Return:
+        np.ndarray: Kernel values, with entry 3 * i + d2 - 1 set to the
+            kernel between env1 and component d2 of environment i.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[1]
+
+    return three_body_mc_vector_jit(
+        env1.bond_array_3,
+        env1.ctype,
+        env1.etypes,
+        env1.cross_bond_inds,
+        env1.cross_bond_dists,
+        env1.triplet_counts,
+        *arrays2,
+        d1,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
 def three_body_mc_grad(
     env1: AtomicEnvironment,
     env2: AtomicEnvironment,
@@ -1707,6 +1782,47 @@ def two_body_mc(
     )
 
 
+def two_body_mc_vector(
+    env1: AtomicEnvironment,
+    arrays2: tuple,
+    d1: int,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+) -> "ndarray":
+    """2-body multi-element kernel between a force component of one
+    environment and all three force components of a set of environments.
+
+    Args:
+        env1 (AtomicEnvironment): First local environment.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_body_arrays.
+        d1 (int): Force component of the first environment.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+
+    Return:
+        np.ndarray: Kernel values, with entry 3 * i + d2 - 1 set to the
+            kernel between env1 and component d2 of environment i.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[0]
+
+    return two_body_mc_vector_jit(
+        env1.bond_array_2,
+        env1.ctype,
+        env1.etypes,
+        *arrays2,
+        d1,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
 def two_body_mc_grad(
     env1: AtomicEnvironment,
     env2: AtomicEnvironment,
@@ -2398,6 +2514,83 @@ def three_body_mc_jit(
     return kern
 
 
+@njit
+def three_body_mc_vector_jit(
+    bond_array_1,
+    c1,
+    etypes1,
+    cross_bond_inds_1,
+    cross_bond_dists_1,
+    triplets_1,
+    bond_arrays_2,
+    etypes_2,
+    cross_bond_inds_2,
+    cross_bond_dists_2,
+    triplets_2,
+    n_bonds_2,
+    ctypes_2,
+    d1,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """3-body multi-element kernel between a force component of one
+    environment and all three force components of a set of stacked
+    environments.
+
+    Args:
+        bond_array_1 (np.ndarray): 3-body bond array of the first
+            environment.
+        c1 (int): Species of the central atom of the first environment.
+        etypes1 (np.ndarray): Species of the neighbors of the first
+            environment.
+        cross_bond_inds_1 (np.ndarray): Cross bond indices of the first
+            environment.
+        cross_bond_dists_1 (np.ndarray): Cross bond distances of the first
+            environment.
+        triplets_1 (np.ndarray): Triplet counts of the first environment.
+        bond_arrays_2 ... ctypes_2: Arrays of the second set, stacked with
+            stack_three_body_arrays.
+        d1 (int): Force component of the first environment.
+        sig (float): 3-body signal variance hyperparameter.
+        ls (float): 3-body length scale hyperparameter.
+        r_cut (float): 3-body cutoff radius.
+        cutoff_func (Callable): Cutoff function.
+
+    Return:
+        np.ndarray: Kernel vector of the second set.
+    """
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros(3 * n_envs_2)
+
+    for n in range(n_envs_2):
+        nb2 = n_bonds_2[n]
+        for d2 in range(1, 4):
+            kern[3 * n + d2 - 1] = three_body_mc_jit(
+                bond_array_1,
+                c1,
+                etypes1,
+                bond_arrays_2[n, :nb2],
+                ctypes_2[n],
+                etypes_2[n, :nb2],
+                cross_bond_inds_1,
+                cross_bond_inds_2[n, :nb2, :nb2],
+                cross_bond_dists_1,
+                cross_bond_dists_2[n, :nb2, :nb2],
+                triplets_1,
+                triplets_2[n, :nb2],
+                d1,
+                d2,
+                sig,
+                ls,
+                r_cut,
+                cutoff_func,
+            )
+
+    return kern
+
+
 @njit
 def three_body_mc_grad_jit(
     bond_array_1,
@@ -3677,6 +3870,66 @@ def two_body_mc_jit(
     return kern
 
 
+@njit
+def two_body_mc_vector_jit(
+    bond_array_1,
+    c1,
+    etypes1,
+    bond_arrays_2,
+    etypes_2,
+    n_bonds_2,
+    ctypes_2,
+    d1,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """2-body multi-element kernel between a force component of one
+    environment and all three force components of a set of stacked
+    environments.
+
+    Args:
+        bond_array_1 (np.ndarray): 2-body bond array of the first
+            environment.
+        c1 (int): Species of the central atom of the first environment.
+        etypes1 (np.ndarray): Species of the neighbors of the first
+            environment.
+        bond_arrays_2 ... ctypes_2: Arrays of the second set, stacked with
+            stack_two_body_arrays.
+        d1 (int): Force component of the first environment.
+        sig (float): 2-body signal variance hyperparameter.
+        ls (float): 2-body length scale hyperparameter.
+        r_cut (float): 2-body cutoff radius.
+        cutoff_func (Callable): Cutoff function.
+
+    Return:
+        np.ndarray: Kernel vector of the second set.
+    """
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros(3 * n_envs_2)
+
+    for n in range(n_envs_2):
+        nb2 = n_bonds_2[n]
+        for d2 in range(1, 4):
+            kern[3 * n + d2 - 1] = two_body_mc_jit(
+                bond_array_1,
+                c1,
+                etypes1,
+                bond_arrays_2[n, :nb2],
+                ctypes_2[n],
+                etypes_2[n, :nb2],
+                d1,
+                d2,
+                sig,
+                ls,
+                r_cut,
+                cutoff_func,
+            )
+
+    return kern
+
+
 @njit
 def two_body_mc_grad_jit(
     bond_array_1,
@@ -4663,6 +4916,703 @@ def many_body_mc_en_jit(q_array_1, q_array_2, c1, c2, species1, species2, sig, l
     return kern
 
 
+# -----------------------------------------------------------------------------
+#                 force/force blocks of the covariance matrix
+# -----------------------------------------------------------------------------
+
+
+def stack_two_body_arrays(envs: list):
+    """Pad the 2-body arrays of a list of environments into stacked arrays
+    that can be passed to Numba.
+
+    Args:
+        envs (list): List of local environments.
+
+    Return:
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray): Stacked bond arrays,
+            environment species, number of bonds and central atom species.
+    """
+    arrays = [env.to_arrays() for env in envs]
+    n_bonds = np.array([a[0].shape[0] for a in arrays], dtype=np.int64)
+    max_bonds = np.max(n_bonds) if len(arrays) > 0 else 0
+
+    bond_arrays = np.zeros((len(arrays), max_bonds, 4))
+    etypes = np.zeros((len(arrays), max_bonds), dtype=np.int8)
+    ctypes = np.zeros(len(arrays), dtype=np.int64)
+    for i, a in enumerate(arrays):
+        bond_arrays[i, : n_bonds[i]] = a[0]
+        etypes[i, : n_bonds[i]] = a[2]
+        ctypes[i] = a[1]
+
+    return bond_arrays, etypes, n_bonds, ctypes
+
+
+def stack_three_body_arrays(envs: list):
+    """Pad the 3-body arrays of a list of environments into stacked arrays
+    that can be passed to Numba.
+
+    Args:
+        envs (list): List of local environments.
+
+    Return:
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+            np.ndarray, np.ndarray): Stacked bond arrays, environment
+            species, cross bond indices, cross bond distances, triplet
+            counts, number of bonds and central atom species.
+    """
+    arrays = [env.to_arrays() for env in envs]
+    n_bonds = np.array([a[3].shape[0] for a in arrays], dtype=np.int64)
+    max_bonds = np.max(n_bonds) if len(arrays) > 0 else 0
+
+    bond_arrays = np.zeros((len(arrays), max_bonds, 4))
+    etypes = np.zeros((len(arrays), max_bonds), dtype=np.int8)
+    cross_bond_inds = np.zeros((len(arrays), max_bonds, max_bonds), dtype=np.int8)
+    cross_bond_dists = np.zeros((len(arrays), max_bonds, max_bonds))
+    triplet_counts = np.zeros((len(arrays), max_bonds), dtype=np.int8)
+    ctypes = np.zeros(len(arrays), dtype=np.int64)
+    for i, a in enumerate(arrays):
+        n = n_bonds[i]
+        bond_arrays[i, :n] = a[3]
+        etypes[i, :n] = a[2][:n]
+        cross_bond_inds[i, :n, :n] = a[4]
+        cross_bond_dists[i, :n, :n] = a[5]
+        triplet_counts[i, :n] = a[6]
+        ctypes[i] = a[1]
+
+    return (
+        bond_arrays,
+        etypes,
+        cross_bond_inds,
+        cross_bond_dists,
+        triplet_counts,
+        n_bonds,
+        ctypes,
+    )
+
+
+def stack_two_plus_three_body_arrays(envs: list):
+    """Stack the 2- and 3-body arrays of a list of environments.
+
+    Args:
+        envs (list): List of local environments.
+
+    Return:
+        tuple: Arrays of stack_two_body_arrays followed by the arrays of
+            stack_three_body_arrays.
+    """
+
+    return stack_two_body_arrays(envs) + stack_three_body_arrays(envs)
+
+
+def two_plus_three_body_mc_force_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> "ndarray":
+    """2+3-body multi-element kernel between all force components of two
+    sets of environments.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_two_plus_three_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_plus_three_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig1, ls1,
+            sig2, ls2).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        np.ndarray: Kernel matrix, with entry (3 * i + d1 - 1, 3 * j + d2 - 1)
+            set to the kernel between component d1 of environment i of the
+            first set and component d2 of environment j of the second set.
+    """
+    two_term = two_body_mc_force_block(
+        arrays1[:4], arrays2[:4], same, hyps[0:2], cutoffs, cutoff_func, parallel
+    )
+    three_term = three_body_mc_force_block(
+        arrays1[4:], arrays2[4:], same, hyps[2:4], cutoffs, cutoff_func, parallel
+    )
+
+    return two_term + three_term
+
+
+def three_body_mc_force_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> "ndarray":
+    """3-body multi-element kernel between all force components of two sets
+    of environments.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_three_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_three_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        np.ndarray: Kernel matrix, with entry (3 * i + d1 - 1, 3 * j + d2 - 1)
+            set to the kernel between component d1 of environment i of the
+            first set and component d2 of environment j of the second set.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[1]
+
+    if parallel:
+        block_jit = three_body_mc_force_block_jit
+    else:
+        block_jit = three_body_mc_force_block_serial_jit
+
+    return block_jit(
+        *arrays1,
+        *arrays2,
+        same,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
+def two_body_mc_force_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> "ndarray":
+    """2-body multi-element kernel between all force components of two sets
+    of environments.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_two_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        np.ndarray: Kernel matrix, with entry (3 * i + d1 - 1, 3 * j + d2 - 1)
+            set to the kernel between component d1 of environment i of the
+            first set and component d2 of environment j of the second set.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[0]
+
+    if parallel:
+        block_jit = two_body_mc_force_block_jit
+    else:
+        block_jit = two_body_mc_force_block_serial_jit
+
+    return block_jit(
+        *arrays1,
+        *arrays2,
+        same,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
+@njit(parallel=True)
+def three_body_mc_force_block_jit(
+    bond_arrays_1,
+    etypes_1,
+    cross_bond_inds_1,
+    cross_bond_dists_1,
+    triplets_1,
+    n_bonds_1,
+    ctypes_1,
+    bond_arrays_2,
+    etypes_2,
+    cross_bond_inds_2,
+    cross_bond_dists_2,
+    triplets_2,
+    n_bonds_2,
+    ctypes_2,
+    same,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """3-body multi-element kernel between all force components of two sets
+    of stacked environments, parallelized over the first set with Numba.
+
+    Args:
+        bond_arrays_1 (np.ndarray): Stacked 3-body bond arrays of the first
+            set of environments.
+        etypes_1 (np.ndarray): Stacked species of the first set.
+        cross_bond_inds_1 (np.ndarray): Stacked cross bond indices of the
+            first set.
+        cross_bond_dists_1 (np.ndarray): Stacked cross bond distances of the
+            first set.
+        triplets_1 (np.ndarray): Stacked triplet counts of the first set.
+        n_bonds_1 (np.ndarray): Number of 3-body bonds of each environment
+            of the first set.
+        ctypes_1 (np.ndarray): Central atom species of the first set.
+        bond_arrays_2 ... ctypes_2: Same arrays for the second set.
+        same (bool): True if the two sets are the same.
+        sig (float): 3-body signal variance hyperparameter.
+        ls (float): 3-body length scale hyperparameter.
+        r_cut (float): 3-body cutoff radius.
+        cutoff_func (Callable): Cutoff function.
+
+    Return:
+        np.ndarray: Kernel matrix of the two sets.
+    """
+    n_envs_1 = bond_arrays_1.shape[0]
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros((3 * n_envs_1, 3 * n_envs_2))
+
+    for m in prange(n_envs_1):
+        nb1 = n_bonds_1[m]
+        if same:
+            lowbound = m
+        else:
+            lowbound = 0
+        for n in range(lowbound, n_envs_2):
+            nb2 = n_bonds_2[n]
+            for d1 in range(1, 4):
+                if same and m == n:
+                    d2_lowbound = d1
+                else:
+                    d2_lowbound = 1
+                for d2 in range(d2_lowbound, 4):
+                    kern_curr = three_body_mc_jit(
+                        bond_arrays_1[m, :nb1],
+                        ctypes_1[m],
+                        etypes_1[m, :nb1],
+                        bond_arrays_2[n, :nb2],
+                        ctypes_2[n],
+                        etypes_2[n, :nb2],
+                        cross_bond_inds_1[m, :nb1, :nb1],
+                        cross_bond_inds_2[n, :nb2, :nb2],
+                        cross_bond_dists_1[m, :nb1, :nb1],
+                        cross_bond_dists_2[n, :nb2, :nb2],
+                        triplets_1[m, :nb1],
+                        triplets_2[n, :nb2],
+                        d1,
+                        d2,
+                        sig,
+                        ls,
+                        r_cut,
+                        cutoff_func,
+                    )
+                    kern[3 * m + d1 - 1, 3 * n + d2 - 1] = kern_curr
+                    if same:
+                        kern[3 * n + d2 - 1, 3 * m + d1 - 1] = kern_curr
+
+    return kern
+
+
+@njit(parallel=True)
+def two_body_mc_force_block_jit(
+    bond_arrays_1,
+    etypes_1,
+    n_bonds_1,
+    ctypes_1,
+    bond_arrays_2,
+    etypes_2,
+    n_bonds_2,
+    ctypes_2,
+    same,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """2-body multi-element kernel between all force components of two sets
+    of stacked environments, parallelized over the first set with Numba.
+
+    Args:
+        bond_arrays_1 (np.ndarray): Stacked 2-body bond arrays of the first
+            set of environments.
+        etypes_1 (np.ndarray): Stacked species of the first set.
+        n_bonds_1 (np.ndarray): Number of bonds of each environment of the
+            first set.
+        ctypes_1 (np.ndarray): Central atom species of the first set.
+        bond_arrays_2 ... ctypes_2: Same arrays for the second set.
+        same (bool): True if the two sets are the same.
+        sig (float): 2-body signal variance hyperparameter.
+        ls (float): 2-body length scale hyperparameter.
+        r_cut (float): 2-body cutoff radius.
+        cutoff_func (Callable): Cutoff function.
+
+    Return:
+        np.ndarray: Kernel matrix of the two sets.
+    """
+    n_envs_1 = bond_arrays_1.shape[0]
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros((3 * n_envs_1, 3 * n_envs_2))
+
+    for m in prange(n_envs_1):
+        nb1 = n_bonds_1[m]
+        if same:
+            lowbound = m
+        else:
+            lowbound = 0
+        for n in range(lowbound, n_envs_2):
+            nb2 = n_bonds_2[n]
+            for d1 in range(1, 4):
+                if same and m == n:
+                    d2_lowbound = d1
+                else:
+                    d2_lowbound = 1
+                for d2 in range(d2_lowbound, 4):
+                    kern_curr = two_body_mc_jit(
+                        bond_arrays_1[m, :nb1],
+                        ctypes_1[m],
+                        etypes_1[m, :nb1],
+                        bond_arrays_2[n, :nb2],
+                        ctypes_2[n],
+                        etypes_2[n, :nb2],
+                        d1,
+                        d2,
+                        sig,
+                        ls,
+                        r_cut,
+                        cutoff_func,
+                    )
+                    kern[3 * m + d1 - 1, 3 * n + d2 - 1] = kern_curr
+                    if same:
+                        kern[3 * n + d2 - 1, 3 * m + d1 - 1] = kern_curr
+
+    return kern
+
+
+def two_plus_three_body_mc_grad_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> ("ndarray", "ndarray"):
+    """2+3-body multi-element kernel between all force components of two
+    sets of environments and its gradient with respect to the
+    hyperparameters.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_two_plus_three_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_plus_three_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig1, ls1,
+            sig2, ls2).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        (np.ndarray, np.ndarray): Kernel matrix, laid out as in
+            two_plus_three_body_mc_force_block, and its gradients with
+            respect to (sig1, ls1, sig2, ls2) stacked along the first axis.
+    """
+    two_kern, two_grad = two_body_mc_grad_block(
+        arrays1[:4], arrays2[:4], same, hyps[0:2], cutoffs, cutoff_func, parallel
+    )
+    three_kern, three_grad = three_body_mc_grad_block(
+        arrays1[4:], arrays2[4:], same, hyps[2:4], cutoffs, cutoff_func, parallel
+    )
+
+    return two_kern + three_kern, np.concatenate((two_grad, three_grad))
+
+
+def three_body_mc_grad_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> ("ndarray", "ndarray"):
+    """3-body multi-element kernel between all force components of two sets
+    of environments and its gradient with respect to the hyperparameters.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_three_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_three_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        (np.ndarray, np.ndarray): Kernel matrix, laid out as in
+            three_body_mc_force_block, and its gradients with respect to
+            (sig, ls) stacked along the first axis.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[1]
+
+    if parallel:
+        block_jit = three_body_mc_grad_block_jit
+    else:
+        block_jit = three_body_mc_grad_block_serial_jit
+
+    return block_jit(
+        *arrays1,
+        *arrays2,
+        same,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
+def two_body_mc_grad_block(
+    arrays1: tuple,
+    arrays2: tuple,
+    same: bool,
+    hyps: "ndarray",
+    cutoffs: "ndarray",
+    cutoff_func: Callable = cf.quadratic_cutoff,
+    parallel: bool = False,
+) -> ("ndarray", "ndarray"):
+    """2-body multi-element kernel between all force components of two sets
+    of environments and its gradient with respect to the hyperparameters.
+
+    Args:
+        arrays1 (tuple): First set of environments, stacked with
+            stack_two_body_arrays.
+        arrays2 (tuple): Second set of environments, stacked with
+            stack_two_body_arrays.
+        same (bool): True if the two sets are the same, in which case only
+            the upper triangle is computed.
+        hyps (np.ndarray): Hyperparameters of the kernel function (sig, ls).
+        cutoffs (np.ndarray): Array containing the 2- and 3-body cutoffs.
+        cutoff_func (Callable): Cutoff function of the kernel.
+        parallel (bool): True to parallelize over the first set with Numba
+            threads. Must be False in forked worker processes.
+
+    Return:
+        (np.ndarray, np.ndarray): Kernel matrix, laid out as in
+            two_body_mc_force_block, and its gradients with respect to
+            (sig, ls) stacked along the first axis.
+    """
+    sig = hyps[0]
+    ls = hyps[1]
+    r_cut = cutoffs[0]
+
+    if parallel:
+        block_jit = two_body_mc_grad_block_jit
+    else:
+        block_jit = two_body_mc_grad_block_serial_jit
+
+    return block_jit(
+        *arrays1,
+        *arrays2,
+        same,
+        sig,
+        ls,
+        r_cut,
+        cutoff_func,
+    )
+
+
+@njit(parallel=True)
+def three_body_mc_grad_block_jit(
+    bond_arrays_1,
+    etypes_1,
+    cross_bond_inds_1,
+    cross_bond_dists_1,
+    triplets_1,
+    n_bonds_1,
+    ctypes_1,
+    bond_arrays_2,
+    etypes_2,
+    cross_bond_inds_2,
+    cross_bond_dists_2,
+    triplets_2,
+    n_bonds_2,
+    ctypes_2,
+    same,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """3-body multi-element kernel between all force components of two sets
+    of stacked environments and its hyperparameter gradient, parallelized
+    over the first set with Numba. The arguments are those of
+    three_body_mc_force_block_jit.
+
+    Return:
+        (np.ndarray, np.ndarray): Kernel matrix of the two sets and its
+            gradients with respect to sig and ls.
+    """
+    n_envs_1 = bond_arrays_1.shape[0]
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros((3 * n_envs_1, 3 * n_envs_2))
+    grad = np.zeros((2, 3 * n_envs_1, 3 * n_envs_2))
+
+    for m in prange(n_envs_1):
+        nb1 = n_bonds_1[m]
+        if same:
+            lowbound = m
+        else:
+            lowbound = 0
+        for n in range(lowbound, n_envs_2):
+            nb2 = n_bonds_2[n]
+            for d1 in range(1, 4):
+                if same and m == n:
+                    d2_lowbound = d1
+                else:
+                    d2_lowbound = 1
+                for d2 in range(d2_lowbound, 4):
+                    kern_curr, grad_curr = three_body_mc_grad_jit(
+                        bond_arrays_1[m, :nb1],
+                        ctypes_1[m],
+                        etypes_1[m, :nb1],
+                        bond_arrays_2[n, :nb2],
+                        ctypes_2[n],
+                        etypes_2[n, :nb2],
+                        cross_bond_inds_1[m, :nb1, :nb1],
+                        cross_bond_inds_2[n, :nb2, :nb2],
+                        cross_bond_dists_1[m, :nb1, :nb1],
+                        cross_bond_dists_2[n, :nb2, :nb2],
+                        triplets_1[m, :nb1],
+                        triplets_2[n, :nb2],
+                        d1,
+                        d2,
+                        sig,
+                        ls,
+                        r_cut,
+                        cutoff_func,
+                    )
+                    i = 3 * m + d1 - 1
+                    j = 3 * n + d2 - 1
+                    kern[i, j] = kern_curr
+                    grad[:, i, j] = grad_curr
+                    if same:
+                        kern[j, i] = kern_curr
+                        grad[:, j, i] = grad_curr
+
+    return kern, grad
+
+
+@njit(parallel=True)
+def two_body_mc_grad_block_jit(
+    bond_arrays_1,
+    etypes_1,
+    n_bonds_1,
+    ctypes_1,
+    bond_arrays_2,
+    etypes_2,
+    n_bonds_2,
+    ctypes_2,
+    same,
+    sig,
+    ls,
+    r_cut,
+    cutoff_func,
+):
+    """2-body multi-element kernel between all force components of two sets
+    of stacked environments and its hyperparameter gradient, parallelized
+    over the first set with Numba. The arguments are those of
+    two_body_mc_force_block_jit.
+
+    Return:
+        (np.ndarray, np.ndarray): Kernel matrix of the two sets and its
+            gradients with respect to sig and ls.
+    """
+    n_envs_1 = bond_arrays_1.shape[0]
+    n_envs_2 = bond_arrays_2.shape[0]
+    kern = np.zeros((3 * n_envs_1, 3 * n_envs_2))
+    grad = np.zeros((2, 3 * n_envs_1, 3 * n_envs_2))
+
+    for m in prange(n_envs_1):
+        nb1 = n_bonds_1[m]
+        if same:
+            lowbound = m
+        else:
+            lowbound = 0
+        for n in range(lowbound, n_envs_2):
+            nb2 = n_bonds_2[n]
+            for d1 in range(1, 4):
+                if same and m == n:
+                    d2_lowbound = d1
+                else:
+                    d2_lowbound = 1
+                for d2 in range(d2_lowbound, 4):
+                    kern_curr, grad_curr = two_body_mc_grad_jit(
+                        bond_arrays_1[m, :nb1],
+                        ctypes_1[m],
+                        etypes_1[m, :nb1],
+                        bond_arrays_2[n, :nb2],
+                        ctypes_2[n],
+                        etypes_2[n, :nb2],
+                        d1,
+                        d2,
+                        sig,
+                        ls,
+                        r_cut,
+                        cutoff_func,
+                    )
+                    i = 3 * m + d1 - 1
+                    j = 3 * n + d2 - 1
+                    kern[i, j] = kern_curr
+                    grad[:, i, j] = grad_curr
+                    if same:
+                        kern[j, i] = kern_curr
+                        grad[:, j, i] = grad_curr
+
+    return kern, grad
+
+
+# Single-threaded versions of the block kernels, for serial builds and for
+# processes forked by gp_algebra, which cannot safely use the Numba threading
+# layer once the parent process has started it.
+three_body_mc_force_block_serial_jit = njit(three_body_mc_force_block_jit.py_func)
+two_body_mc_force_block_serial_jit = njit(two_body_mc_force_block_jit.py_func)
+three_body_mc_grad_block_serial_jit = njit(three_body_mc_grad_block_jit.py_func)
+two_body_mc_grad_block_serial_jit = njit(two_body_mc_grad_block_jit.py_func)
+
+
 _str_to_kernel = {
     "two_body_mc": two_body_mc,
     "two_body_mc_en": two_body_mc_en,
@@ -4734,3 +5684,41 @@ _str_to_kernel = {
     "2+many_efs_force": "not implemented",
     "2+many_efs_energy": "not implemented",
 }
+
+# Kernels that evaluate a force component of a test environment against all
+# three force components of a set of environments in one call, keyed by the
+# corresponding force/force kernel, together with the function that stacks
+# the environment arrays they take.
+_force_vector_kernel = {
+    two_body_mc: (two_body_mc_vector, stack_two_body_arrays),
+    three_body_mc: (three_body_mc_vector, stack_three_body_arrays),
+    two_plus_three_body_mc: (
+        two_plus_three_body_mc_vector,
+        stack_two_plus_three_body_arrays,
+    ),
+}
+
+# Kernels that evaluate all force components of two sets of environments in
+# one call, keyed by the corresponding force/force kernel, together with the
+# function that stacks the environment arrays they take.
+_force_block_kernel = {
+    two_body_mc: (two_body_mc_force_block, stack_two_body_arrays),
+    three_body_mc: (three_body_mc_force_block, stack_three_body_arrays),
+    two_plus_three_body_mc: (
+        two_plus_three_body_mc_force_block,
+        stack_two_plus_three_body_arrays,
+    ),
+}
+
+# Kernels that evaluate all force components of two sets of environments and
+# their hyperparameter gradients in one call, keyed by the corresponding
+# force/force kernel gradient, together with the function that stacks the
+# environment arrays they take.
+_grad_block_kernel = {
+    two_body_mc_grad: (two_body_mc_grad_block, stack_two_body_arrays),
+    three_body_mc_grad: (three_body_mc_grad_block, stack_three_body_arrays),
+    two_plus_three_body_mc_grad: (
+        two_plus_three_body_mc_grad_block,
+        stack_two_plus_three_body_arrays,
+    ),
+}
@@ -1,5 +1,6 @@
 import numpy as np
 
+from functools import lru_cache
 from flare.kernels import sc, mc_simple, mc_sephyps
 from flare.parameters import Parameters
 
@@ -14,6 +15,17 @@ from_mask_to_args converts the hyperparameter vector and the dictionary of
 
 from_grad_to_mask(grad, hyps_mask) converts the gradient matrix to the actual
     gradient matrix by removing the fixed dimensions.
+
+kernel_to_force_vector returns the batched version of a force/force kernel
+    and the function that stacks the environment arrays it takes, which are
+    used by gp_algebra to build kernel vectors.
+
+kernel_to_force_block returns the Numba-parallel version of a force/force
+    kernel and the function that stacks the environment arrays it takes,
+    which are used by gp_algebra to build the force block of Ky.
+
+kernel_to_grad_block does the same for a force/force kernel gradient, which
+    is used by gp_algebra to build Ky and its hyperparameter derivatives.
 """
 
 
@@ -54,30 +66,10 @@ def str_to_kernel_set(
         else:
             stk = mc_simple._str_to_kernel
 
-    # b2 = Two body in use, b3 = Three body in use
-    str_terms = {
-        "2": ["2", "two", "twobody"],
-        "3": ["3", "three", "threebody"],
-        "many": ["mb", "manybody", "many"],
-    }
-
     if isinstance(kernels, str):
         kernels = [kernels]
 
-    prefix = ""
-    for term in str_terms:
-        add = False
-        for s in str_terms[term]:
-            for k in kernels:
-                if s in k.lower():
-                    add = True
-        if add:
-            if len(prefix) > 0:
-                prefix += "+"
-            prefix += term
-
-    if len(prefix) == 0:
-        raise RuntimeError(f"the name has to include at least one number {kernels}")
+    prefix = _kernel_prefix(tuple(kernels))
 
     for suffix in [
         "",
@@ -102,6 +94,83 @@ def str_to_kernel_set(
     )
 
 
+@lru_cache(maxsize=None)
+def _kernel_prefix(kernels: tuple):
+    """
+    Return the prefix of the kernel functions (e.g. "2+3") matching a tuple
+    of kernel names. The result is cached, since the same kernel names are
+    parsed every time a GP is created or loaded.
+    """
+
+    # b2 = Two body in use, b3 = Three body in use
+    str_terms = {
+        "2": ["2", "two", "twobody"],
+        "3": ["3", "three", "threebody"],
+        "many": ["mb", "manybody", "many"],
+    }
+
+    prefix = ""
+    for term in str_terms:
+        add = False
+        for s in str_terms[term]:
+            for k in kernels:
+                if s in k.lower():
+                    add = True
+        if add:
+            if len(prefix) > 0:
+                prefix += "+"
+            prefix += term
+
+    if len(prefix) == 0:
+        raise RuntimeError(
+            f"the name has to include at least one number {list(kernels)}"
+        )
+
+    return prefix
+
+
+def kernel_to_force_vector(kernel):
+    """
+    Return the kernel that evaluates a force component of a test environment
+    against all three force components of a set of environments in a single
+    call and the function that stacks the environment arrays it takes, or
+    None if the force/force kernel has no batched version.
+
+    :param kernel: force/force kernel function
+    :return: (batched kernel function, stack function) or None
+    """
+
+    return mc_simple._force_vector_kernel.get(kernel, None)
+
+
+def kernel_to_force_block(kernel):
+    """
+    Return the kernel that evaluates all force components of two sets of
+    environments in a single call and the function that stacks the
+    environment arrays it takes, or None if the force/force kernel has no
+    block version.
+
+    :param kernel: force/force kernel function
+    :return: (block kernel function, stack function) or None
+    """
+
+    return mc_simple._force_block_kernel.get(kernel, None)
+
+
+def kernel_to_grad_block(kernel_grad):
+    """
+    Return the kernel that evaluates all force components of two sets of
+    environments and their hyperparameter gradients in a single call and
+    the function that stacks the environment arrays it takes, or None if
+    the kernel gradient has no block version.
+
+    :param kernel_grad: force/force kernel gradient function
+    :return: (block kernel gradient function, stack function) or None
+    """
+
+    return mc_simple._grad_block_kernel.get(kernel_grad, None)
+
+
 def from_mask_to_args(hyps, cutoffs, hyps_mask=None):
     """Return the tuple of arguments needed for kernel function.
     The order of the tuple has to be exactly the same as the one taken by
@@ -198,7 +267,8 @@ def from_grad_to_mask(grad, hyps_mask=None):
     Return gradient which only includes hyperparameters
     which are meant to vary
 
-    :param grad: original gradient vector
+    :param grad: original gradient vector, or gradient matrices stacked
+        along the first axis
     :param hyps_mask: dictionary for hyper-parameters
 
     :return: newgrad
@@ -221,9 +291,7 @@ def from_grad_to_mask(grad, hyps_mask=None):
     else:
         hm = hyp_index
 
-    newgrad = np.zeros(len(hm), dtype=np.float64)
-    for i, mapid in enumerate(hm):
-        newgrad[i] = grad[mapid]
+    newgrad = np.asarray(grad, dtype=np.float64)[np.asarray(hm, dtype=np.int64)]
 
     return newgrad
 
@@ -238,6 +306,16 @@ def kernel_str_to_array(kernel_name: str):
              energy_and_force kernel
     """
 
+    return list(_kernel_terms(kernel_name))
+
+
+@lru_cache(maxsize=None)
+def _kernel_terms(kernel_name: str):
+    """
+    Return the tuple of kernel terms in a kernel name. The result is cached,
+    since the same names are parsed every time a GP is created or loaded.
+    """
+
     #  kernel name should be replace with kernel array
     str_terms = {
         "twobody": ["2", "two", "twobody"],
@@ -253,4 +331,4 @@ def kernel_str_to_array(kernel_name: str):
                 add = True
         if add:
             array += [term]
-    return array
+    return tuple(array)
@@ -27,10 +27,15 @@ from flare.gp_algebra import (
     get_like_from_mats,
     get_neg_like_grad,
     get_ky_mat_update,
+    cholesky_factor,
+    cholesky_solve,
+    cholesky_inverse,
+    close_pool,
     _global_training_data,
     _global_training_labels,
     _global_training_structures,
     _global_energy_labels,
+    _global_training_arrays,
     get_Ky_mat,
     get_kernel_vector,
     get_neg_like,
@@ -786,6 +791,8 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
             _global_training_labels.pop(f"{self.name}_{expert_id}", None)
             # _global_training_structures.pop(f"{self.name}_{expert_id}",None)
             _global_energy_labels.pop(f"{self.name}_{expert_id}", None)
+            close_pool(f"{self.name}_{expert_id}")
+            _global_training_arrays.pop(f"{self.name}_{expert_id}", None)
 
     def sync_experts_data(self, expert_id: int):
         """ Reset global variables. """
@@ -842,10 +849,9 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
         :return:
         """
 
-        l_mat = np.linalg.cholesky(ky_mat)
-        l_mat_inv = np.linalg.inv(l_mat)
-        ky_mat_inv = l_mat_inv.T @ l_mat_inv
-        alpha = np.matmul(ky_mat_inv, self.all_labels[expert_id])
+        l_mat = cholesky_factor(ky_mat)
+        ky_mat_inv = cholesky_inverse(l_mat)
+        alpha = cholesky_solve(l_mat, self.all_labels[expert_id])
 
         self.ky_mat[expert_id] = ky_mat
         self.l_mat[expert_id] = l_mat
@@ -1072,6 +1078,12 @@ class RobustBayesianCommitteeMachine(GaussianProcess):
 
         return gp_model
 
+    def __del__(self):
+        # the process pools and stacked arrays are kept per expert
+        for i in range(len(getattr(self, "training_data", []))):
+            self.unsync_experts_data(i)
+        GaussianProcess.__del__(self)
+
     def __str__(self):
         """String representation of the GP model."""
 
@@ -130,6 +130,13 @@ class TestInitialization:
         for per_atom_par in [True, False]:
             GaussianProcess(per_atom_par=per_atom_par)
 
+    def test_device_initialization(self):
+        gp_model = GaussianProcess(device="gpu")
+        if not flare.gp_algebra._cupy_present:
+            assert gp_model.device == "cpu"
+        with raises(ValueError):
+            GaussianProcess(device="tpu")
+
 
 class TestDataUpdating:
     @pytest.mark.parametrize("multihyps", multihyps_list)
@@ -147,6 +154,26 @@ class TestDataUpdating:
 
         assert len(test_gp.training_data) == params["noa"] + oldsize
         assert len(test_gp.training_labels_np) == (params["noa"] + oldsize) * 3
+        assert np.array_equal(
+            test_gp.training_labels_np, np.hstack(test_gp.training_labels)
+        )
+
+    def test_add_one_env(self, params):
+
+        test_gp = GaussianProcess(kernels=["twobody"], cutoffs={"twobody": 0.8})
+        test_structure, forces = get_random_structure(
+            params["cell"], params["unique_species"], params["noa"]
+        )
+
+        for atom in range(params["noa"]):
+            env = AtomicEnvironment(test_structure, atom, test_gp.cutoffs)
+            test_gp.add_one_env(env, forces[atom])
+
+        assert np.array_equal(test_gp.training_labels_np, forces.ravel())
+        assert np.array_equal(
+            GaussianProcess.force_list_to_np(list(forces)), forces.ravel()
+        )
+        assert GaussianProcess.force_list_to_np([]).shape == (0,)
 
 
 class TestTraining:
@@ -171,6 +198,69 @@ class TestTraining:
         # check if hyperparams have been updated
         assert hyps != hyp_post
 
+    def test_train_skip(self, all_gps, params):
+        """Check that training is skipped while the hyperparameters and the
+        training set are unchanged when hyps_tol is set."""
+
+        test_gp = deepcopy(all_gps[False])
+        test_gp.maxiter = 1
+        assert test_gp.train() is not None
+
+        test_gp.hyps_tol = 1e-8
+        assert test_gp.train() is None
+
+        test_structure, forces = get_random_structure(
+            params["cell"], params["unique_species"], params["noa"]
+        )
+        test_gp.update_db(test_structure, forces)
+        assert test_gp.train() is not None
+
+    def test_train_warm_start(self, all_gps, mocker):
+        """Check that a second BFGS run starts from the inverse Hessian
+        found by the first one."""
+
+        test_gp = deepcopy(all_gps[False])
+        test_gp.opt_algorithm = "BFGS"
+        test_gp.set_L_alpha = mocker.Mock()
+
+        n_hyps = len(test_gp.hyps)
+        hess_inv = np.random.rand(n_hyps, n_hyps)
+        train_result = OptimizeResult(
+            x=np.copy(test_gp.hyps), fun=1.0, jac=np.zeros(n_hyps), hess_inv=hess_inv
+        )
+        mocker.patch("flare.gp._bfgs_hess_inv0", True)
+        mocker.patch("flare.gp.minimize", return_value=train_result)
+
+        test_gp.train()
+        args, kwargs = flare.gp.minimize.call_args
+        assert "hess_inv0" not in kwargs["options"]
+
+        test_gp.train()
+        args, kwargs = flare.gp.minimize.call_args
+        assert kwargs["options"]["hess_inv0"] is hess_inv
+
+        # older versions of scipy do not take a starting inverse Hessian
+        mocker.patch("flare.gp._bfgs_hess_inv0", False)
+        test_gp.train()
+        args, kwargs = flare.gp.minimize.call_args
+        assert "hess_inv0" not in kwargs["options"]
+
+    def test_train_old_pickle(self, all_gps):
+        """Check that a GP pickled before the warm start settings existed can
+        still be trained."""
+
+        test_gp = deepcopy(all_gps[False])
+        test_gp.maxiter = 1
+        for key in ["maxcor", "hyps_tol", "retrain_fraction", "_last_opt_state"]:
+            del test_gp.__dict__[key]
+
+        with open("test_gp_old.pickle", "wb") as f:
+            pickle.dump(test_gp, f)
+        new_gp = GaussianProcess.from_file("test_gp_old.pickle")
+        os.remove("test_gp_old.pickle")
+
+        assert new_gp.train() is not None
+
     def test_train_failure(self, all_gps, params, mocker):
         """
         Tests the case when 'L-BFGS-B' fails due to a linear algebra error and
@@ -282,6 +372,29 @@ class TestAlgebra:
         assert np.isclose(force_pred[0], force_pred_2)
         assert np.isclose(force_var[0], force_var_2)
 
+    def test_predict_single_precision(self, two_plus_three_gp, validation_env):
+        """Check that single precision predictions match double precision
+        ones."""
+
+        test_gp = two_plus_three_gp
+        test_gp.parallel = False
+        test_gp.per_atom_par = False
+
+        test_gp.precision = "f64"
+        force_f64, var_f64 = test_gp.predict(validation_env, 1)
+        en_f64 = test_gp.predict_efs(validation_env)
+
+        test_gp.precision = "f32"
+        force_f32, var_f32 = test_gp.predict(validation_env, 1)
+        en_f32 = test_gp.predict_efs(validation_env)
+        test_gp.precision = "f64"
+
+        assert isinstance(force_f32, float)
+        assert np.isclose(force_f32, force_f64, rtol=1e-4, atol=1e-6)
+        assert np.isclose(var_f32, var_f64, rtol=1e-4, atol=1e-6)
+        for val_f32, val_f64 in zip(en_f32, en_f64):
+            assert np.allclose(val_f32, val_f64, rtol=1e-4, atol=1e-6)
+
     @pytest.mark.parametrize("par, n_cpus", [(True, 2), (False, 1)])
     @pytest.mark.parametrize("multihyps", multihyps_list)
     def test_set_L_alpha(self, all_gps, params, par, n_cpus, multihyps):
@@ -290,6 +403,21 @@ class TestAlgebra:
         test_gp.n_cpus = n_cpus
         test_gp.set_L_alpha()
 
+        # the inverse covariance matrix is rebuilt lazily from L
+        assert np.allclose(
+            np.matmul(test_gp.ky_mat_inv, test_gp.ky_mat),
+            np.eye(test_gp.ky_mat.shape[0]),
+        )
+
+    def test_state_hash(self, all_gps):
+        """Swapping the kernel functions without renaming the kernels must
+        change the state that L and alpha are computed from."""
+
+        test_gp = deepcopy(all_gps[False])
+        state_hash = test_gp.state_hash()
+        test_gp.kernel = mc_simple.two_body_mc
+        assert test_gp.state_hash() != state_hash
+
     @pytest.mark.parametrize("par, n_cpus", [(True, 2), (False, 1)])
     @pytest.mark.parametrize("multihyps", multihyps_list)
     def test_update_L_alpha(self, all_gps, params, par, n_cpus, multihyps):
@@ -306,12 +434,29 @@ class TestAlgebra:
         test_gp.update_db(test_structure, forces, energy=energy)
         test_gp.update_L_alpha()
 
+        # add an energy label only, so that the new row is appended to Ky and
+        # L is extended rather than refactored
+        test_structure, _ = get_random_structure(
+            params["cell"], params["unique_species"], 2
+        )
+        test_gp.update_db(test_structure, energy=energy)
+        test_gp.update_L_alpha()
+
         # compare results with set_L_alpha
         ky_mat_from_update = np.copy(test_gp.ky_mat)
+        l_mat_from_update = np.copy(test_gp.l_mat)
+        alpha_from_update = np.copy(test_gp.alpha)
         test_gp.set_L_alpha()
         ky_mat_from_set = np.copy(test_gp.ky_mat)
 
         assert np.all(np.absolute(ky_mat_from_update - ky_mat_from_set)) < 1e-6
+        assert np.allclose(l_mat_from_update, test_gp.l_mat)
+        assert np.allclose(alpha_from_update, test_gp.alpha)
+
+        # updating again without new data leaves L untouched
+        l_mat = test_gp.l_mat
+        test_gp.update_L_alpha()
+        assert test_gp.l_mat is l_mat
 
 
 class TestIO:
@@ -381,6 +526,20 @@ class TestIO:
             )
         os.remove("test_gp_write.json")
 
+        test_gp.write_model("test_gp_write", "npz")
+
+        new_gp = GaussianProcess.from_file("test_gp_write.npz")
+        assert np.allclose(new_gp.l_mat, test_gp.l_mat)
+        new_gp = GaussianProcess.from_file("test_gp_write", format="npz")
+        assert np.allclose(new_gp.l_mat, test_gp.l_mat)
+        for d in [1, 2, 3]:
+            assert np.all(
+                test_gp.predict(x_t=validation_env, d=d)
+                == new_gp.predict(x_t=validation_env, d=d)
+            )
+        os.remove("test_gp_write.json")
+        os.remove("test_gp_write.npz")
+
         with raises(ValueError):
             test_gp.write_model("test_gp_write", "cucumber")
 
@@ -576,9 +735,21 @@ class TestHelper:
             old_cutoffs[k] = test_gp.cutoffs[k]
             new_cutoffs[k] = 0.5 + old_cutoffs[k]
         test_gp.hyps_mask["cutoffs"] = new_cutoffs
+
+        # a pool forked with the old environments must not be reused
+        flare.gp_algebra.get_pool(test_gp.name, 2)
+
         test_gp.adjust_cutoffs(
             new_cutoffs, train=False, new_hyps_mask=test_gp.hyps_mask
         )
+        assert test_gp.name not in flare.gp_algebra._global_pools
+
+        # the stacked training arrays are rebuilt with the new cutoffs
+        cache = flare.gp_algebra._global_training_arrays.get(test_gp.name, {})
+        for stack_function, (_, arrays) in cache.items():
+            ref = stack_function(test_gp.training_data)
+            for array, array_ref in zip(arrays, ref):
+                assert np.array_equal(array, array_ref)
 
         assert np.array_equal(
             list(test_gp.cutoffs.values()),
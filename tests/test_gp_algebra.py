@@ -40,8 +40,18 @@ from flare.gp_algebra import (
     update_force_block,
     update_energy_block,
     update_force_energy_block,
+    update_l_mat,
+    blocked_cholesky,
+    cholesky_factor,
+    cholesky_solve,
+    cholesky_inverse,
+    jittered_cholesky_factor,
     efs_kern_vec,
+    get_pool,
+    close_pool,
+    get_training_arrays,
 )
+from flare.kernels.mc_simple import stack_two_body_arrays
 
 from tests.fake_gp import get_tstp
 
@@ -291,6 +301,115 @@ def test_ky_mat_update(params, ihyps):
     assert np.isclose(ky_mat, ky_mat0, rtol=1e-10).all(), "update function is wrong"
 
 
+def test_force_block_serial_then_parallel(params):
+    """A serial build followed by a build on two Numba threads in the same
+    process gives the same matrix."""
+
+    name, cutoffs, hyps_mask_list, energy_noise = params
+    hyps_mask = hyps_mask_list[-1]
+    hyps = hyps_mask["hyps"]
+    kernel = str_to_kernel_set(hyps_mask["kernels"], "mc", hyps_mask)
+
+    ky_mat0 = get_Ky_mat(
+        hyps, name, kernel[0], kernel[2], kernel[3], energy_noise, cutoffs
+    )
+    ky_mat = get_Ky_mat(
+        hyps,
+        name,
+        kernel[0],
+        kernel[2],
+        kernel[3],
+        energy_noise,
+        cutoffs,
+        n_cpus=2,
+        n_sample=5,
+    )
+    assert np.allclose(ky_mat, ky_mat0, rtol=1e-10)
+
+
+def test_training_arrays(params):
+
+    name = params[0]
+    training_data = flare.gp_algebra._global_training_data[name]
+
+    arrays = get_training_arrays(name, stack_two_body_arrays, 2, 5)
+    ref = stack_two_body_arrays(training_data)
+    for array, array_ref in zip(arrays, ref):
+        assert np.array_equal(array, array_ref[2:5])
+
+    # the arrays are cached until the training data changes
+    cached = flare.gp_algebra._global_training_arrays[name][stack_two_body_arrays]
+    get_training_arrays(name, stack_two_body_arrays, 0, 1)
+    assert (
+        flare.gp_algebra._global_training_arrays[name][stack_two_body_arrays]
+        is cached
+    )
+
+    flare.gp_algebra._global_training_data[name] = training_data[::-1]
+    arrays = get_training_arrays(name, stack_two_body_arrays, 0, 1)
+    flare.gp_algebra._global_training_data[name] = training_data
+    assert np.array_equal(arrays[0][0], ref[0][-1])
+
+
+def test_update_l_mat(ky_mat_ref):
+
+    l_mat_ref = np.linalg.cholesky(ky_mat_ref)
+
+    for old_size in [3, 15, ky_mat_ref.shape[0]]:
+        l_mat_old = np.linalg.cholesky(ky_mat_ref[:old_size, :old_size])
+        l_mat = update_l_mat(l_mat_old, ky_mat_ref)
+        assert np.allclose(l_mat, l_mat_ref), "Cholesky update is wrong"
+
+
+def test_cholesky_helpers(ky_mat_ref):
+
+    l_mat = cholesky_factor(ky_mat_ref)
+    assert np.allclose(l_mat, np.linalg.cholesky(ky_mat_ref))
+
+    b = np.arange(ky_mat_ref.shape[0], dtype=np.float64)
+    assert np.allclose(cholesky_solve(l_mat, b), np.linalg.solve(ky_mat_ref, b))
+    assert np.allclose(cholesky_inverse(l_mat), np.linalg.inv(ky_mat_ref))
+
+    with pytest.raises(np.linalg.LinAlgError):
+        cholesky_factor(-ky_mat_ref)
+
+
+def test_jittered_cholesky(ky_mat_ref):
+
+    l_mat, ky_mat = jittered_cholesky_factor(ky_mat_ref)
+    assert np.allclose(l_mat, np.linalg.cholesky(ky_mat_ref))
+    assert ky_mat is ky_mat_ref
+
+    # a singular matrix is factored after adding a jitter to a copy
+    vec = np.arange(1, 5, dtype=np.float64)
+    singular = np.outer(vec, vec)
+    l_mat, ky_mat = jittered_cholesky_factor(singular)
+    assert np.allclose(singular, np.outer(vec, vec))
+    assert np.allclose(np.matmul(l_mat, l_mat.T), ky_mat)
+    assert np.allclose(ky_mat, singular, atol=1e-4)
+    assert np.all(np.diagonal(ky_mat) > np.diagonal(singular))
+
+    with pytest.raises(np.linalg.LinAlgError):
+        jittered_cholesky_factor(-ky_mat_ref)
+
+
+@pytest.mark.parametrize("block_size", [1, 4, 7])
+def test_blocked_cholesky(ky_mat_ref, block_size):
+
+    l_mat = cholesky_factor(ky_mat_ref, block_size)
+    assert np.allclose(l_mat, np.linalg.cholesky(ky_mat_ref))
+    assert np.allclose(l_mat, np.tril(l_mat))
+
+    # in place, the factor is written over the matrix
+    ky_mat = np.array(ky_mat_ref)
+    l_mat = blocked_cholesky(ky_mat, block_size, overwrite=True)
+    assert l_mat is ky_mat
+    assert np.allclose(l_mat, np.linalg.cholesky(ky_mat_ref))
+
+    with pytest.raises(ValueError):
+        cholesky_factor(ky_mat_ref, -block_size)
+
+
 @pytest.mark.parametrize("ihyps", [0, 1, -1])
 def test_kernel_vector(params, ihyps):
 
@@ -328,6 +447,23 @@ def test_kernel_vector(params, ihyps):
     assert vec.shape[0] == size1 * 3 + size2
 
 
+def test_get_pool(params):
+
+    name = params[0]
+
+    pool = get_pool(name, 2)
+    assert get_pool(name, 2) is pool, "pool is not reused"
+
+    # a pool forked before the training data changed must not be reused
+    training_labels = flare.gp_algebra._global_training_labels[name]
+    flare.gp_algebra._global_training_labels[name] = np.copy(training_labels)
+    assert get_pool(name, 2) is not pool, "stale pool is reused"
+    flare.gp_algebra._global_training_labels[name] = training_labels
+
+    close_pool(name)
+    assert name not in flare.gp_algebra._global_pools
+
+
 @pytest.mark.parametrize("ihyps", [0, 1, -1])
 def test_en_kern_vec(params, ihyps):
 
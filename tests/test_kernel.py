@@ -6,7 +6,12 @@ from numpy import isclose
 from numpy.random import random, randint
 
 from flare import env, struc, gp
-from flare.kernels.utils import str_to_kernel_set
+from flare.kernels.utils import (
+    str_to_kernel_set,
+    kernel_to_force_vector,
+    kernel_to_force_block,
+    kernel_to_grad_block,
+)
 
 from .fake_gp import generate_mb_envs
 
@@ -192,3 +197,118 @@ def test_hyps_grad(kernels, kernel_type):
         print("numerical gradients", hgrad)
         print("analytical gradients", grad_test[1][i])
         assert isclose(grad_test[1][i], hgrad, rtol=tol)
+
+
+@pytest.mark.parametrize("kernels", [["2"], ["3"], ["2", "3"]])
+def test_force_vector(kernels):
+    """Check that the batched force kernel matches the force kernel evaluated
+    component by component."""
+
+    d1 = randint(1, 3)
+    cell = 1e7 * np.eye(3)
+    cutoffs = np.array([1.5, 1.2, 1.2])
+
+    np.random.seed(10)
+    hyps = generate_hm(kernels)
+    env1 = generate_mb_envs(cutoffs, cell, 0, d1)[0][0]
+    training_data = [generate_mb_envs(cutoffs, cell, 0, 1)[0][0] for _ in range(3)]
+
+    kernel, _, _, _, _, _, _ = str_to_kernel_set(kernels, "mc")
+    assert kernel_to_force_vector(kernel) is not None
+    vector_kernel, stack_function = kernel_to_force_vector(kernel)
+
+    kern_vec = vector_kernel(env1, stack_function(training_data), d1, hyps, cutoffs)
+
+    for m, env2 in enumerate(training_data):
+        for d2 in range(3):
+            kern = kernel(env1, env2, d1, d2 + 1, hyps, cutoffs)
+            assert isclose(kern_vec[3 * m + d2], kern, rtol=1e-12)
+
+
+@pytest.mark.parametrize("kernels", [["2"], ["3"], ["2", "3"]])
+@pytest.mark.parametrize("same", [True, False])
+def test_force_block(kernels, same):
+    """Check that the block force kernel matches the force kernel evaluated
+    element by element."""
+
+    cell = 1e7 * np.eye(3)
+    cutoffs = np.array([1.5, 1.2, 1.2])
+
+    np.random.seed(10)
+    hyps = generate_hm(kernels)
+    envs1 = [generate_mb_envs(cutoffs, cell, 0, 1)[0][0] for _ in range(3)]
+    if same:
+        envs2 = envs1
+    else:
+        envs2 = [generate_mb_envs(cutoffs, cell, 0, 1)[0][0] for _ in range(2)]
+
+    kernel, _, _, _, _, _, _ = str_to_kernel_set(kernels, "mc")
+    assert kernel_to_force_block(kernel) is not None
+    block_kernel, stack_function = kernel_to_force_block(kernel)
+
+    kern_block = block_kernel(
+        stack_function(envs1), stack_function(envs2), same, hyps, cutoffs
+    )
+    assert kern_block.shape == (3 * len(envs1), 3 * len(envs2))
+
+    # the Numba-threaded version gives the same block
+    kern_block_parallel = block_kernel(
+        stack_function(envs1),
+        stack_function(envs2),
+        same,
+        hyps,
+        cutoffs,
+        parallel=True,
+    )
+    assert np.allclose(kern_block_parallel, kern_block, rtol=1e-12)
+
+    for m, env1 in enumerate(envs1):
+        for n, env2 in enumerate(envs2):
+            for d1 in range(3):
+                for d2 in range(3):
+                    kern = kernel(env1, env2, d1 + 1, d2 + 1, hyps, cutoffs)
+                    assert isclose(kern_block[3 * m + d1, 3 * n + d2], kern, rtol=1e-12)
+
+
+
+@pytest.mark.parametrize("kernels", [["2"], ["3"], ["2", "3"]])
+@pytest.mark.parametrize("same", [True, False])
+def test_grad_block(kernels, same):
+    """Check that the block kernel gradient matches the kernel gradient
+    evaluated element by element."""
+
+    cell = 1e7 * np.eye(3)
+    cutoffs = np.array([1.5, 1.2, 1.2])
+
+    np.random.seed(10)
+    hyps = generate_hm(kernels)
+    envs1 = [generate_mb_envs(cutoffs, cell, 0, 1)[0][0] for _ in range(3)]
+    if same:
+        envs2 = envs1
+    else:
+        envs2 = [generate_mb_envs(cutoffs, cell, 0, 1)[0][0] for _ in range(2)]
+
+    _, kernel_grad, _, _, _, _, _ = str_to_kernel_set(kernels, "mc")
+    assert kernel_to_grad_block(kernel_grad) is not None
+    block_kernel, stack_function = kernel_to_grad_block(kernel_grad)
+
+    arrays1 = stack_function(envs1)
+    arrays2 = stack_function(envs2)
+    kern_block, grad_block = block_kernel(arrays1, arrays2, same, hyps, cutoffs)
+    assert grad_block.shape == (len(hyps) - 1, 3 * len(envs1), 3 * len(envs2))
+
+    kern_parallel, grad_parallel = block_kernel(
+        arrays1, arrays2, same, hyps, cutoffs, parallel=True
+    )
+    assert np.allclose(kern_parallel, kern_block, rtol=1e-12)
+    assert np.allclose(grad_parallel, grad_block, rtol=1e-12)
+
+    for m, env1 in enumerate(envs1):
+        for n, env2 in enumerate(envs2):
+            for d1 in range(3):
+                for d2 in range(3):
+                    kern, grad = kernel_grad(env1, env2, d1 + 1, d2 + 1, hyps, cutoffs)
+                    i = 3 * m + d1
+                    j = 3 * n + d2
+                    assert isclose(kern_block[i, j], kern, rtol=1e-12)
+                    assert np.allclose(grad_block[:, i, j], grad, rtol=1e-12)
\ No newline at end of file
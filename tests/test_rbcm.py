@@ -4,6 +4,7 @@ import os as os
 import numpy as np
 from flare.struc import Structure
 from flare.env import AtomicEnvironment
+import flare.gp_algebra
 from flare.gp_algebra import get_kernel_vector
 
 TEST_DIR = os.path.dirname(__file__)
@@ -115,6 +116,28 @@ def test_prediction():
         assert pred_var == rbcm_pred[1]
 
 
+def test_expert_pools():
+    """
+    Test that the process pools built for the experts during parallel
+    predictions are closed with the RBCM.
+    :return:
+    """
+
+    rbcm = RobustBayesianCommitteeMachine(
+        ndata_per_expert=5, parallel=True, per_atom_par=False, n_cpus=2
+    )
+    for env in methanol_envs[:10]:
+        rbcm.add_one_env(env, env.force)
+    rbcm.predict(methanol_envs[-1], 1)
+
+    names = [f"{rbcm.name}_{i}" for i in range(rbcm.n_experts)]
+    assert any(name in flare.gp_algebra._global_pools for name in names)
+
+    rbcm.__del__()
+    for name in names:
+        assert name not in flare.gp_algebra._global_pools
+
+
 def test_to_from_gp():
     """
     To/from methods for creating new RBCMs